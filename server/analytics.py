@@ -0,0 +1,234 @@
+"""Training-volume analytics over daily rollups that the write routes keep current with set-based deltas."""
+
+from datetime import date
+
+from sqlalchemy import case, func
+
+from models import (
+    db, Exercise, Workout, WorkoutExercise,
+    DailyWorkoutRollup, DailyExerciseRollup, upsert,
+)
+
+# Period label of a day. Weeks are ISO weeks (Monday first), as in trainingload.py.
+PERIODS = {
+    "day": lambda day: day.isoformat(),
+    "week": lambda day: "{0:04d}-W{1:02d}".format(*day.isocalendar()),
+    "month": lambda day: f"{day.year:04d}-{day.month:02d}",
+    "year": lambda day: f"{day.year:04d}",
+}
+
+ENTRY_MEASURES = ("sessions", "total_sets", "total_reps", "volume", "time_under_tension_seconds")
+WORKOUT_MEASURES = ("workouts", "duration_minutes")
+
+
+# ── Base-table expressions ────────────────────────────────────────────────────
+def _entry_sums(sign=1):
+    we = WorkoutExercise
+    sets = func.coalesce(we.sets, 0)
+    reps = func.coalesce(we.reps, 0)
+    return [
+        (sign * func.count(we.id)).label("sessions"),
+        (sign * func.sum(sets)).label("total_sets"),
+        (sign * func.sum(reps)).label("total_reps"),
+        (sign * func.sum(sets * reps)).label("volume"),
+        (sign * func.sum(
+            func.coalesce(we.duration_seconds, 0) * case((we.sets.is_(None), 1), else_=we.sets)
+        )).label("time_under_tension_seconds"),
+    ]
+
+
+def _workout_sums(sign=1):
+    return [
+        (sign * func.count(Workout.id)).label("workouts"),
+        (sign * func.sum(Workout.duration_minutes)).label("duration_minutes"),
+    ]
+
+
+# ── Rollup maintenance ────────────────────────────────────────────────────────
+def _merge(table, key_columns, measures, select):
+    """INSERT the grouped `select` into `table`, adding onto existing rows."""
+    stmt = upsert(table).from_select([*key_columns, *measures], select)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c[k] for k in key_columns],
+        set_={m: table.c[m] + stmt.excluded[m] for m in measures},
+    )
+    db.session.execute(stmt)
+
+
+def add_workouts(where, sign=1):
+    """Add (sign=1) or remove (sign=-1) the workouts matching `where`."""
+    select = (
+        db.select(Workout.date, *_workout_sums(sign))
+        .where(where)
+        .group_by(Workout.date)
+    )
+    _merge(DailyWorkoutRollup.__table__, ["day"], WORKOUT_MEASURES, select)
+    if sign < 0:
+        db.session.execute(
+            db.delete(DailyWorkoutRollup).where(DailyWorkoutRollup.workouts <= 0)
+        )
+
+
+def add_entries(where, sign=1):
+    """Add (sign=1) or remove (sign=-1) the workout-exercise entries matching `where`."""
+    we = WorkoutExercise
+    select = (
+        db.select(Workout.date, we.exercise_id, *_entry_sums(sign))
+        .join(Workout, Workout.id == we.workout_id)
+        .where(where)
+        .group_by(Workout.date, we.exercise_id)
+    )
+    _merge(DailyExerciseRollup.__table__, ["day", "exercise_id"], ENTRY_MEASURES, select)
+    # ... and the day's total volume on the per-day rollup
+    sets, reps = func.coalesce(we.sets, 0), func.coalesce(we.reps, 0)
+    day_volume = (
+        db.select(Workout.date, (sign * func.sum(sets * reps)).label("volume"))
+        .join(Workout, Workout.id == we.workout_id)
+        .where(where)
+        .group_by(Workout.date)
+    )
+    _merge(DailyWorkoutRollup.__table__, ["day"], ["volume"], day_volume)
+    if sign < 0:
+        db.session.execute(
+            db.delete(DailyExerciseRollup).where(DailyExerciseRollup.sessions <= 0)
+        )
+
+
+def drop_exercise(exercise_id):
+    """Forget every rollup row of an exercise that is being deleted."""
+    r = DailyExerciseRollup
+    _merge(
+        DailyWorkoutRollup.__table__, ["day"], ["volume"],
+        db.select(r.day, (-r.volume).label("volume")).where(r.exercise_id == exercise_id),
+    )
+    db.session.execute(
+        db.delete(DailyExerciseRollup).where(DailyExerciseRollup.exercise_id == exercise_id)
+    )
+
+
+def rebuild():
+    """Recompute both rollup tables from scratch (after bulk loads)."""
+    db.session.execute(db.delete(DailyWorkoutRollup))
+    db.session.execute(db.delete(DailyExerciseRollup))
+    add_workouts(db.true())
+    add_entries(db.true())
+    db.session.commit()
+
+
+# ── Queries ───────────────────────────────────────────────────────────────────
+def parse_filters(args):
+    """
+    Read `from`, `to`, `exercise_id`, `period` and `source` from a query string.
+    Raises ValueError with a client-facing message.
+    """
+    filters = {}
+    for key in ("from", "to"):
+        if args.get(key):
+            try:
+                filters[key] = date.fromisoformat(args[key])
+            except ValueError:
+                raise ValueError(f"'{key}' must be a date (YYYY-MM-DD).")
+    if args.get("exercise_id"):
+        try:
+            filters["exercise_id"] = int(args["exercise_id"])
+        except ValueError:
+            raise ValueError("'exercise_id' must be an integer.")
+    filters["period"] = args.get("period", "month")
+    if filters["period"] not in PERIODS:
+        raise ValueError(f"'period' must be one of: {', '.join(PERIODS)}.")
+    filters["source"] = args.get("source", "rollup")
+    if filters["source"] not in ("rollup", "live"):
+        raise ValueError("'source' must be 'rollup' or 'live'.")
+    return filters
+
+
+def _entry_source(filters):
+    """(from-clause, day, exercise_id, measures) to aggregate entries over."""
+    if filters["source"] == "live":
+        we = WorkoutExercise
+        joined = we.__table__.join(Workout.__table__, Workout.id == we.workout_id)
+        return joined, Workout.date, we.exercise_id, _entry_sums()
+    r = DailyExerciseRollup
+    measures = [func.sum(getattr(r, m)).label(m) for m in ENTRY_MEASURES]
+    return r.__table__, r.day, r.exercise_id, measures
+
+
+def _workout_source(filters):
+    """(from-clause, day, measures) to aggregate workouts over."""
+    if filters["source"] == "live":
+        return Workout.__table__, Workout.date, _workout_sums()
+    r = DailyWorkoutRollup
+    measures = [func.sum(getattr(r, m)).label(m) for m in WORKOUT_MEASURES]
+    return r.__table__, r.day, measures
+
+
+def _in_range(day, filters):
+    conditions = []
+    if "from" in filters:
+        conditions.append(day >= filters["from"])
+    if "to" in filters:
+        conditions.append(day <= filters["to"])
+    return conditions
+
+
+def exercise_totals(filters):
+    """Per-exercise totals over the date range, heaviest volume first."""
+    source, day, exercise_id, measures = _entry_source(filters)
+    grouped = (
+        db.select(exercise_id.label("exercise_id"), *measures)
+        .select_from(source)
+        .where(*_in_range(day, filters))
+        .group_by(exercise_id)
+    )
+    if "exercise_id" in filters:
+        grouped = grouped.where(exercise_id == filters["exercise_id"])
+    query = grouped.subquery()
+    stmt = (
+        db.select(Exercise.id, Exercise.name, *[query.c[m] for m in ENTRY_MEASURES])
+        .join(query, query.c.exercise_id == Exercise.id)
+        .order_by(query.c.volume.desc(), Exercise.id)
+    )
+    return [
+        {"exercise_id": row.id, "name": row.name, **{m: row._mapping[m] for m in ENTRY_MEASURES}}
+        for row in db.session.execute(stmt)
+    ]
+
+
+def _by_period(rows, period, names):
+    """Sum per-day rows into {period label: {measure: total}}."""
+    label = PERIODS[period]
+    buckets = {}
+    for row in rows:
+        bucket = buckets.setdefault(label(row.day), dict.fromkeys(names, 0))
+        for name in names:
+            bucket[name] += row._mapping[name] or 0
+    return buckets
+
+
+def period_totals(filters):
+    """Totals bucketed by day/week/month/year, oldest first."""
+    source, day, exercise_id, measures = _entry_source(filters)
+    entries = (
+        db.select(day.label("day"), *measures)
+        .select_from(source)
+        .where(*_in_range(day, filters))
+        .group_by(day)
+    )
+    if "exercise_id" in filters:
+        entries = entries.where(exercise_id == filters["exercise_id"])
+    buckets = _by_period(db.session.execute(entries), filters["period"], ENTRY_MEASURES)
+
+    # Workout counts and minutes only make sense across all exercises.
+    if "exercise_id" not in filters:
+        wsource, wday, wmeasures = _workout_source(filters)
+        stmt = (
+            db.select(wday.label("day"), *wmeasures)
+            .select_from(wsource)
+            .where(*_in_range(wday, filters))
+            .group_by(wday)
+        )
+        workouts = _by_period(db.session.execute(stmt), filters["period"], WORKOUT_MEASURES)
+        for key, totals in workouts.items():
+            buckets.setdefault(key, dict.fromkeys(ENTRY_MEASURES, 0)).update(totals)
+
+    return [{"period": key, **buckets[key]} for key in sorted(buckets)]
@@ -0,0 +1,776 @@
+#!/usr/bin/env python3
+"""
+Per-route benchmark on synthetic databases: latency percentiles, throughput and SQL query counts.
+
+Run from the server/ directory:
+    python bench.py --sizes 1000,10000,100000 --out bench.json
+    python bench.py --out new.json --compare bench.json          # exit 1 on p95/query regressions
+    python bench.py --parity --sizes 1000,100000                 # listings.py vs the schemas
+    python bench.py --search --sizes 100000,1000000              # FTS5 search vs a LIKE scan
+    python bench.py --compression --sizes 10000,100000           # gzip/brotli levels, real payloads
+    python bench.py --queries --sizes 1000,20000                 # exit 1 if queries grow with data
+    python bench.py --consistency --sizes 1000 --writes 2000     # exit 1 if rollups/records drift
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+# Dataset shape per size: `size` workouts, this many exercises and entries per workout.
+EXERCISES = 200
+PER_WORKOUT = 5
+
+
+# ── Scenarios ─────────────────────────────────────────────────────────────────
+# Each scenario is called once per request with (client, rng, state) and
+# returns the response. `state` carries ids between write scenarios so that
+# deletes remove rows the benchmark itself created.
+def list_workouts(client, rng, state):
+    return client.get("/workouts?limit=50")
+
+
+def list_workouts_deep(client, rng, state):
+    return client.get(f"/workouts?limit=50&cursor={state['workout_cursor']}")
+
+
+def filter_workouts_by_exercise(client, rng, state):
+    return client.get(f"/workouts?limit=50&exercise_id={rng.randint(1, EXERCISES)}")
+
+
+def filter_workouts_by_category(client, rng, state):
+    category = rng.choice(("strength", "cardio", "balance"))
+    return client.get(f"/workouts?limit=50&category={category}&equipment_needed=false")
+
+
+def filter_workouts_by_dates(client, rng, state):
+    # A 30-day window somewhere in the generator's ten years, longer sessions only
+    start = date(2015, 1, 1) + timedelta(days=rng.randrange(3620))
+    end = start + timedelta(days=30)
+    return client.get(f"/workouts?limit=50&from={start}&to={end}&min_duration=60")
+
+
+def list_exercises(client, rng, state):
+    return client.get("/exercises?limit=50")
+
+
+def get_workout(client, rng, state):
+    return client.get(f"/workouts/{rng.randint(1, state['size'])}")
+
+
+def get_exercise(client, rng, state):
+    return client.get(f"/exercises/{rng.randint(1, EXERCISES)}")
+
+
+def get_exercise_records(client, rng, state):
+    return client.get(f"/exercises/{rng.randint(1, EXERCISES)}/records")
+
+
+def volume_analytics(client, rng, state):
+    return client.get("/analytics/volume?period=month&from=2018-01-01&to=2020-12-31")
+
+
+def exercise_analytics(client, rng, state):
+    return client.get("/analytics/exercises?from=2018-01-01&to=2020-12-31")
+
+
+def training_load(client, rng, state):
+    # A different year-long window each call, so most requests miss the cache
+    to = date(2019, 1, 1) + timedelta(days=rng.randint(0, 720))
+    return client.get(f"/analytics/load?from={to - timedelta(days=364)}&to={to}")
+
+
+def search_workouts(client, rng, state):
+    word = rng.choice(("deadlift", "squat", "mobility", "conditioning", "grip"))
+    return client.get(f"/search?q={word}&limit=50")
+
+
+def search_exercises(client, rng, state):
+    word = rng.choice(("bench", "row", "kettlebell swing", "dumbbell cu"))
+    return client.get(f"/search?type=exercises&q={word}&limit=50")
+
+
+def create_workout(client, rng, state):
+    response = client.post("/workouts", json={
+        "date": f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        "duration_minutes": rng.randint(15, 180),
+        "notes": "bench",
+    })
+    state["created_workouts"].append(response.get_json()["id"])
+    return response
+
+
+def add_exercise_to_workout(client, rng, state):
+    workout_id = state["created_workouts"][state["linked"] % len(state["created_workouts"])]
+    exercise_id = state["linked"] // len(state["created_workouts"]) + 1
+    state["linked"] += 1
+    return client.post(
+        f"/workouts/{workout_id}/exercises/{exercise_id}/workout_exercises",
+        json={"sets": 3, "reps": 10},
+    )
+
+
+def create_workouts_batch(client, rng, state):
+    return client.post("/workouts/batch", json=[
+        {
+            "date": "2024-06-01", "duration_minutes": 45,
+            "workout_exercises": [
+                {"exercise_id": e, "sets": 3, "reps": 8}
+                for e in rng.sample(range(1, EXERCISES + 1), PER_WORKOUT)
+            ],
+        }
+        for _ in range(10)
+    ])
+
+
+def delete_workout(client, rng, state):
+    return client.delete(f"/workouts/{state['created_workouts'].pop()}")
+
+
+def create_exercise(client, rng, state):
+    state["exercise_seq"] += 1
+    response = client.post("/exercises", json={
+        "name": f"Bench Exercise {state['exercise_seq']}", "category": "other",
+    })
+    state["created_exercises"].append(response.get_json()["id"])
+    return response
+
+
+def delete_exercise(client, rng, state):
+    return client.delete(f"/exercises/{state['created_exercises'].pop()}")
+
+
+# Order matters: writes that consume ids run after the writes that create them.
+SCENARIOS = [
+    ("GET /workouts", list_workouts),
+    ("GET /workouts (deep page)", list_workouts_deep),
+    ("GET /workouts?exercise_id", filter_workouts_by_exercise),
+    ("GET /workouts?category", filter_workouts_by_category),
+    ("GET /workouts?from&to", filter_workouts_by_dates),
+    ("GET /workouts/<id>", get_workout),
+    ("GET /exercises", list_exercises),
+    ("GET /exercises/<id>", get_exercise),
+    ("GET /exercises/<id>/records", get_exercise_records),
+    ("GET /search", search_workouts),
+    ("GET /search?type=exercises", search_exercises),
+    ("GET /analytics/volume", volume_analytics),
+    ("GET /analytics/exercises", exercise_analytics),
+    ("GET /analytics/load", training_load),
+    ("POST /workouts", create_workout),
+    ("POST .../workout_exercises", add_exercise_to_workout),
+    ("POST /workouts/batch", create_workouts_batch),
+    ("DELETE /workouts/<id>", delete_workout),
+    ("POST /exercises", create_exercise),
+    ("DELETE /exercises/<id>", delete_exercise),
+]
+
+
+# ── Measurement ───────────────────────────────────────────────────────────────
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-pct * len(sorted_values) // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def summarize(latencies, queries, elapsed):
+    latencies = sorted(latencies)
+    return {
+        "requests": len(latencies),
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else None,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "queries_per_request": round(sum(queries) / len(queries), 2) if queries else 0,
+    }
+
+
+def bench_app(on_disk, tmpdir):
+    """A fresh app for one dataset: in memory, or in a SQLite file under `tmpdir`."""
+    from app import create_app
+    from config import ProductionConfig
+
+    if not on_disk:
+        return create_app("testing")
+
+    class OnDiskConfig(ProductionConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(tmpdir, 'bench.db')}"
+        SQLALCHEMY_ENGINE_OPTIONS = None
+        CREATE_ALL = True
+
+    return create_app(OnDiskConfig)
+
+
+def run_size(size, requests, seed, on_disk=False):
+    """Build a database of `size` workouts and benchmark every scenario on it."""
+    tmpdir = tempfile.mkdtemp(prefix="bench-")
+
+    from sqlalchemy import event, text
+
+    from models import db
+    from seed import generate
+
+    app = bench_app(on_disk, tmpdir)
+    results = {}
+    with app.app_context():
+        generate(EXERCISES, size, size * PER_WORKOUT, seed=seed)
+        db.session.execute(text("ANALYZE"))
+        db.session.commit()
+
+        client = app.test_client()
+        rng = random.Random(seed)
+        query_count = [0]
+
+        def count(*args):
+            query_count[0] += 1
+
+        event.listen(db.engine, "before_cursor_execute", count)
+
+        deep = client.get(f"/workouts?limit={max(1, size // 2)}").headers.get("X-Next-Cursor")
+        state = {
+            "size": size, "workout_cursor": deep or "",
+            "created_workouts": [], "created_exercises": [],
+            "linked": 0, "exercise_seq": 0,
+        }
+
+        for name, scenario in SCENARIOS:
+            latencies, queries = [], []
+            began = time.perf_counter()
+            for _ in range(requests):
+                query_count[0] = 0
+                start = time.perf_counter()
+                response = scenario(client, rng, state)
+                latencies.append(time.perf_counter() - start)
+                queries.append(query_count[0])
+                if response.status_code >= 400:
+                    raise RuntimeError(f"{name} returned {response.status_code}: {response.data[:200]}")
+            results[name] = summarize(latencies, queries, time.perf_counter() - began)
+            print(f"  [{size:>9,}] {name:<28} p50={results[name]['p50_ms']:>8.2f}ms "
+                  f"p95={results[name]['p95_ms']:>8.2f}ms "
+                  f"q/req={results[name]['queries_per_request']}", flush=True)
+
+        event.remove(db.engine, "before_cursor_execute", count)
+        db.session.remove()
+        db.engine.dispose()
+
+    shutil.rmtree(tmpdir, ignore_errors=True)
+    return results
+
+
+# ── Query counts ──────────────────────────────────────────────────────────────
+# Read routes whose statement count must not depend on the amount of data.
+# (`?all=true` is left out: it loads nested rows IN_CHUNK ids per statement.)
+QUERY_COUNT_URLS = [
+    ("GET /workouts", "/workouts?limit=50"),
+    ("GET /workouts?include=", "/workouts?limit=50&include="),
+    ("GET /workouts/<id>", "/workouts/{id}"),
+    ("GET /exercises/<id>", "/exercises/{id}"),
+]
+
+
+def run_query_counts(size, seed):
+    """Statements issued by each of QUERY_COUNT_URLS (first, uncached request) at `size`."""
+    from sqlalchemy import event
+
+    import cache
+    from models import db
+    from seed import generate
+
+    app = bench_app(False, None)
+    results = {}
+    with app.app_context():
+        generate(EXERCISES, size, size * PER_WORKOUT, seed=seed)
+        client = app.test_client()
+        query_count = [0]
+
+        def count(*args):
+            query_count[0] += 1
+
+        event.listen(db.engine, "before_cursor_execute", count)
+        for label, url in QUERY_COUNT_URLS:
+            counts = set()
+            for id in (1, 2, 3):
+                for response_cache in cache.caches():
+                    response_cache.clear()
+                query_count[0] = 0
+                response = client.get(url.format(id=id))
+                if response.status_code != 200:
+                    raise RuntimeError(f"{label} returned {response.status_code}")
+                counts.add(query_count[0])
+            results[label] = max(counts)
+            print(f"  [{size:>9,}] {label:<26} queries={sorted(counts)}", flush=True)
+        event.remove(db.engine, "before_cursor_execute", count)
+        db.session.remove()
+        db.engine.dispose()
+    return results
+
+
+# ── Consistency ───────────────────────────────────────────────────────────────
+# Random writes land in a short window so they keep hitting the same days and
+# the same exercises' records.
+CONSISTENCY_START = date(2020, 1, 1)
+CONSISTENCY_DAYS = 60
+
+
+def random_entries(rng, exercise_ids, most=4):
+    entries = []
+    for exercise_id in rng.sample(exercise_ids, min(len(exercise_ids), rng.randint(0, most))):
+        if rng.random() < 0.3:
+            entries.append({"exercise_id": exercise_id, "duration_seconds": rng.randint(10, 300)})
+        else:
+            entries.append({"exercise_id": exercise_id, "sets": rng.randint(1, 6), "reps": rng.randint(1, 20)})
+    return entries
+
+
+def random_write(client, rng, workout_ids, exercise_ids):
+    """One randomly chosen write route, on existing ids; returns (label, response)."""
+    day = CONSISTENCY_START + timedelta(days=rng.randrange(CONSISTENCY_DAYS))
+    choice = rng.random()
+    if choice < 0.15:
+        return "POST /workouts", client.post("/workouts", json={
+            "date": day.isoformat(), "duration_minutes": rng.randint(15, 120),
+        })
+    if choice < 0.3:
+        return "POST /workouts/batch", client.post("/workouts/batch", json=[
+            {
+                "date": (day + timedelta(days=i)).isoformat(), "duration_minutes": rng.randint(15, 120),
+                "workout_exercises": random_entries(rng, exercise_ids),
+            }
+            for i in range(rng.randint(1, 3))
+        ])
+    if choice < 0.5:
+        entry = random_entries(rng, exercise_ids, most=1) or [{"exercise_id": exercise_ids[0], "sets": 1}]
+        exercise_id = entry[0].pop("exercise_id")
+        return "POST .../workout_exercises", client.post(
+            f"/workouts/{rng.choice(workout_ids)}/exercises/{exercise_id}/workout_exercises",
+            json=entry[0],
+        )
+    if choice < 0.7:
+        return "PUT /workouts/<id>/exercises", client.put(
+            f"/workouts/{rng.choice(workout_ids)}/exercises", json=random_entries(rng, exercise_ids),
+        )
+    if choice < 0.8:
+        return "DELETE /workouts/<id>", client.delete(f"/workouts/{rng.choice(workout_ids)}")
+    if choice < 0.85:
+        last = day + timedelta(days=rng.randint(0, 2))
+        return "DELETE /workouts?from&to", client.delete(f"/workouts?from={day}&to={last}")
+    if choice < 0.95:
+        return "POST /exercises", client.post("/exercises", json={
+            "name": f"Consistency Exercise {rng.getrandbits(48)}", "category": "other",
+        })
+    return "DELETE /exercises/<id>", client.delete(f"/exercises/{rng.choice(exercise_ids)}")
+
+
+def table_rows(model):
+    """Every row of `model`'s table, as a set of tuples."""
+    from models import db
+
+    return {tuple(row) for row in db.session.execute(db.select(model.__table__))}
+
+
+def run_consistency(size, writes, seed):
+    """
+    Apply `writes` random writes, then compare the maintained rollups and records with a
+    rebuild. Returns {table: number of rows that differ}.
+    """
+    import analytics
+    import records
+    from models import db, Exercise, Workout, DailyWorkoutRollup, DailyExerciseRollup, PersonalRecord
+    from seed import generate
+
+    app = bench_app(False, None)
+    results = {}
+    with app.app_context():
+        generate(EXERCISES, size, size * PER_WORKOUT, seed=seed,
+                 start=CONSISTENCY_START, days=CONSISTENCY_DAYS)
+        client = app.test_client()
+        rng = random.Random(seed)
+        for _ in range(writes):
+            workout_ids = db.session.scalars(db.select(Workout.id)).all() or [0]
+            exercise_ids = db.session.scalars(db.select(Exercise.id)).all() or [0]
+            label, response = random_write(client, rng, workout_ids, exercise_ids)
+            if response.status_code >= 500:
+                raise RuntimeError(f"{label} returned {response.status_code}: {response.data[:200]}")
+
+        tables = (DailyWorkoutRollup, DailyExerciseRollup, PersonalRecord)
+        maintained = {model: table_rows(model) for model in tables}
+        analytics.rebuild()
+        records.rebuild()
+        for model in tables:
+            rebuilt = table_rows(model)
+            differing = maintained[model] ^ rebuilt
+            results[model.__tablename__] = len(differing)
+            print(f"  [{size:>9,}] {model.__tablename__:<24} rows={len(rebuilt):>7,} "
+                  f"differing={len(differing)}", flush=True)
+            for row in sorted(differing, key=str)[:5]:
+                side = "maintained" if row in maintained[model] else "rebuilt"
+                print(f"      only in {side}: {row}")
+        db.session.remove()
+        db.engine.dispose()
+    return results
+
+
+# ── Listing parity ────────────────────────────────────────────────────────────
+def best_of(fn, repeat=3):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def run_parity(size, seed, on_disk=False):
+    """
+    Compare listings.py against the marshmallow schemas on a database of `size`
+    workouts. Returns {listing: {...}}; `identical` is False on any byte mismatch.
+    """
+    tmpdir = tempfile.mkdtemp(prefix="bench-")
+
+    from routes import workout_graph, exercise_graph, WORKOUT_KEYSET, EXERCISE_KEYSET
+    from fieldsets import WORKOUT_FIELDS, EXERCISE_FIELDS
+    from listings import (
+        WORKOUT_COLUMNS, EXERCISE_COLUMNS, WORKOUT_SORT, EXERCISE_SORT,
+        columns, dump_workouts, dump_exercises,
+    )
+    from models import db, Exercise, Workout
+    from seed import generate
+
+    def workout_case(args):
+        fieldset = WORKOUT_FIELDS.parse(args)
+        schema = WORKOUT_FIELDS.schema(fieldset)
+        return (
+            lambda: schema.dumps(
+                Workout.query.options(*workout_graph(fieldset)).order_by(*WORKOUT_KEYSET.order_by()).all(), many=True),
+            lambda: dump_workouts(
+                db.session.query(*columns(WORKOUT_COLUMNS, fieldset, WORKOUT_SORT))
+                .order_by(*WORKOUT_KEYSET.order_by()).all(), fieldset),
+        )
+
+    def exercise_case(args):
+        fieldset = EXERCISE_FIELDS.parse(args)
+        schema = EXERCISE_FIELDS.schema(fieldset)
+        return (
+            lambda: schema.dumps(
+                Exercise.query.options(*exercise_graph(fieldset)).order_by(*EXERCISE_KEYSET.order_by()).all(), many=True),
+            lambda: dump_exercises(
+                db.session.query(*columns(EXERCISE_COLUMNS, fieldset, EXERCISE_SORT))
+                .order_by(*EXERCISE_KEYSET.order_by()).all(), fieldset),
+        )
+
+    app = bench_app(on_disk, tmpdir)
+    results = {}
+    with app.app_context():
+        generate(EXERCISES, size, size * PER_WORKOUT, seed=seed)
+        # An exercise nobody has used, to cover the empty nested list.
+        db.session.add(Exercise(name="Unused", category="other"))
+        db.session.commit()
+
+        cases = {
+            "workouts": workout_case({}),
+            "workouts?include=workout_exercises": workout_case({"include": "workout_exercises"}),
+            "workouts?fields=date&include=": workout_case({"fields": "date", "include": ""}),
+            "exercises": exercise_case({}),
+            "exercises?fields=name&include=": exercise_case({"fields": "name", "include": ""}),
+        }
+        for name, (schema_path, fast_path) in cases.items():
+            db.session.expunge_all()
+            schema_time, expected = best_of(schema_path)
+            db.session.expunge_all()
+            fast_time, actual = best_of(fast_path)
+            results[name] = {
+                "identical": expected == actual,
+                "bytes": len(actual),
+                "schema_s": round(schema_time, 4),
+                "fast_s": round(fast_time, 4),
+                "speedup": round(schema_time / fast_time, 2) if fast_time else None,
+            }
+            print(f"  [{size:>9,}] {name:<10} identical={results[name]['identical']} "
+                  f"schema={schema_time:.3f}s fast={fast_time:.3f}s "
+                  f"speedup={results[name]['speedup']}x", flush=True)
+
+        db.session.remove()
+        db.engine.dispose()
+
+    shutil.rmtree(tmpdir, ignore_errors=True)
+    return results
+
+
+# ── Search: FTS5 against LIKE ─────────────────────────────────────────────────
+# (label, search string); "zercher" is planted in a few notes by run_search.
+SEARCH_CASES = [
+    ("common word", "deadlift"),
+    ("two words", "squat pr"),
+    ("prefix", "condition"),
+    ("rare word", "zercher"),
+    ("no match", "snatch"),
+]
+RARE_NOTES = 20
+
+
+def run_search(size, seed, on_disk=False):
+    """
+    Time the first page of workout-note searches through FTS5 and through a
+    LIKE scan on a database of `size` workouts. Returns {case: {...}}.
+    """
+    tmpdir = tempfile.mkdtemp(prefix="bench-")
+
+    from models import db, Workout
+    from listings import WORKOUT_COLUMNS
+    from seed import generate
+    import search
+
+    app = bench_app(on_disk, tmpdir)
+    results = {}
+    with app.app_context():
+        # Notes are all that is searched; one entry per workout keeps setup quick.
+        generate(EXERCISES, size, size, seed=seed)
+        rng = random.Random(seed)
+        for workout_id in rng.sample(range(1, size + 1), min(RARE_NOTES, size)):
+            db.session.get(Workout, workout_id).notes = "Zercher squats, finally."
+        db.session.commit()
+        notes = db.session.query(Workout).filter(Workout.notes.isnot(None)).count()
+
+        for label, text in SEARCH_CASES:
+            words = search.terms(text)
+            order = "rank" if search.is_selective("workouts", words) else "recent"
+            builds = {
+                "fts": lambda: search.fts_query("workouts", words, WORKOUT_COLUMNS, order),
+                "fts_ranked": lambda: search.fts_query("workouts", words, WORKOUT_COLUMNS, "rank"),
+                "like": lambda: search.like_query("workouts", words, WORKOUT_COLUMNS),
+            }
+            timings = {}
+            for method, build in builds.items():
+                query, keyset = build()
+                timings[method], _ = best_of(lambda: keyset.page(query, 50))
+            matches = builds["fts"]()[0].count()
+            results[label] = {
+                "q": text, "notes": notes, "matches": matches, "order": order,
+                **{f"{method}_ms": round(s * 1000, 3) for method, s in timings.items()},
+                "speedup": round(timings["like"] / timings["fts"], 1) if timings["fts"] else None,
+            }
+            print(f"  [{size:>9,}] {label:<12} q={text!r:<12} matches={matches:<8,} "
+                  f"fts={timings['fts'] * 1000:>7.2f}ms ({order}) "
+                  f"fts ranked={timings['fts_ranked'] * 1000:>7.2f}ms "
+                  f"like={timings['like'] * 1000:>7.2f}ms", flush=True)
+
+        db.session.remove()
+        db.engine.dispose()
+
+    shutil.rmtree(tmpdir, ignore_errors=True)
+    return results
+
+
+# ── Compression: CPU time against bytes saved ─────────────────────────────────
+# Levels tried per encoding; brotli only when the package is installed. Brotli
+# 11 is left out: at well under 1 MB/s it takes tens of seconds on a listing.
+COMPRESSION_LEVELS = {"gzip": (1, 6, 9), "br": (1, 4, 5, 9)}
+
+
+def compression_payloads(client):
+    """(label, body) for the responses worth compressing, fetched uncompressed."""
+    from sqlalchemy import func
+
+    from models import db, WorkoutExercise
+
+    popular = db.session.scalar(
+        db.select(WorkoutExercise.exercise_id)
+        .group_by(WorkoutExercise.exercise_id)
+        .order_by(func.count().desc())
+        .limit(1)
+    )
+    urls = [
+        ("GET /workouts/<id>", "/workouts/1"),
+        ("GET /workouts?limit=100", "/workouts?limit=100"),
+        ("GET /workouts?all=true", "/workouts?all=true"),
+        ("GET /exercises?all=true", "/exercises?all=true"),
+        ("GET /exercises/<popular>", f"/exercises/{popular}"),
+        ("GET /analytics/load (1y)", "/analytics/load?from=2019-01-01&to=2019-12-31"),
+    ]
+    return [(label, client.get(url).get_data()) for label, url in urls]
+
+
+def run_compression(size, seed, on_disk=False):
+    """
+    Compress real payloads from a database of `size` workouts with every
+    encoding and level. Returns {payload: {"bytes": n, "<enc>-<level>": {...}}}.
+    """
+    tmpdir = tempfile.mkdtemp(prefix="bench-")
+
+    from models import db
+    from seed import generate
+    import compression
+
+    app = bench_app(on_disk, tmpdir)
+    results = {}
+    with app.app_context():
+        generate(EXERCISES, size, size * PER_WORKOUT, seed=seed)
+        client = app.test_client()
+        for label, body in compression_payloads(client):
+            results[label] = {"bytes": len(body)}
+            print(f"  [{size:>9,}] {label} — {len(body):,} bytes")
+            for encoding in compression.encodings():
+                for level in COMPRESSION_LEVELS[encoding]:
+                    seconds, data = best_of(lambda: compression.compress(body, encoding, level))
+                    saved = len(body) - len(data)
+                    results[label][f"{encoding}-{level}"] = row = {
+                        "bytes": len(data),
+                        "ratio": round(len(body) / len(data), 2),
+                        "ms": round(seconds * 1000, 3),
+                        "mb_per_s": round(len(body) / seconds / 1e6, 1) if seconds else None,
+                        "us_per_kb_saved": round(seconds * 1e6 / (saved / 1024), 2) if saved > 0 else None,
+                    }
+                    print(f"      {encoding:>4}-{level:<2} {row['bytes']:>11,} bytes "
+                          f"x{row['ratio']:<6} {row['ms']:>9.2f}ms {row['mb_per_s']:>7} MB/s "
+                          f"{row['us_per_kb_saved']} µs/KB saved", flush=True)
+
+        db.session.remove()
+        db.engine.dispose()
+
+    shutil.rmtree(tmpdir, ignore_errors=True)
+    return results
+
+
+# ── Comparison ────────────────────────────────────────────────────────────────
+def compare(baseline, current, threshold):
+    """Return a list of human-readable regressions between two result files."""
+    regressions = []
+    for size, routes in current["results"].items():
+        for name, now in routes.items():
+            before = baseline.get("results", {}).get(size, {}).get(name)
+            if not before:
+                continue
+            if before["p95_ms"] and now["p95_ms"] > before["p95_ms"] * (1 + threshold):
+                regressions.append(
+                    f"[{size}] {name}: p95 {before['p95_ms']}ms → {now['p95_ms']}ms"
+                )
+            if now["queries_per_request"] > before["queries_per_request"]:
+                regressions.append(
+                    f"[{size}] {name}: queries/request "
+                    f"{before['queries_per_request']} → {now['queries_per_request']}"
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark every API route.")
+    parser.add_argument("--sizes", default="1000,10000,100000",
+                        help="comma-separated workout counts (default 1000,10000,100000)")
+    parser.add_argument("--requests", type=int, default=100, help="requests per route")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", help="write results as JSON to this path")
+    parser.add_argument("--compare", help="baseline JSON from a previous run")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed p95 growth before failing (default 0.25 = 25%%)")
+    parser.add_argument("--parity", action="store_true",
+                        help="check fast listing output against the schemas instead")
+    parser.add_argument("--search", action="store_true",
+                        help="compare FTS5 search against a LIKE scan instead")
+    parser.add_argument("--compression", action="store_true",
+                        help="time gzip/brotli levels against bytes saved on real payloads instead")
+    parser.add_argument("--queries", action="store_true",
+                        help="fail if a read route's query count grows with the dataset instead")
+    parser.add_argument("--consistency", action="store_true",
+                        help="check rollups and records against a rebuild after random writes instead")
+    parser.add_argument("--writes", type=int, default=500, help="random writes for --consistency")
+    parser.add_argument("--on-disk", action="store_true",
+                        help="use a temporary SQLite file with production settings, not memory")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",")]
+    output = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "requests_per_route": args.requests,
+            "seed": args.seed,
+        },
+        "results": {},
+    }
+
+    output["meta"]["database"] = "file" if args.on_disk else "memory"
+    if args.queries:
+        for size in sizes:
+            print(f"Dataset: {size:,} workouts")
+            output["results"][str(size)] = run_query_counts(size, args.seed)
+        changed = [
+            label for label, _ in QUERY_COUNT_URLS
+            if len({counts[label] for counts in output["results"].values()}) > 1
+        ]
+        for label in changed:
+            print(f"  {label}: " + ", ".join(
+                f"{size}={counts[label]}" for size, counts in output["results"].items()))
+        print(f"\n{'❌' if changed else '✅'} {len(changed)} route(s) issue more queries on more data.")
+        return 1 if changed else 0
+
+    if args.consistency:
+        differing = 0
+        for size in sizes:
+            print(f"Dataset: {size:,} workouts, {args.writes:,} random writes")
+            result = run_consistency(size, args.writes, args.seed)
+            output["results"][str(size)] = result
+            differing += sum(result.values())
+        print(f"\n{'❌' if differing else '✅'} {differing} row(s) differ from a rebuild.")
+        return 1 if differing else 0
+
+    if args.parity:
+        mismatches = 0
+        for size in sizes:
+            print(f"Dataset: {size:,} workouts")
+            result = run_parity(size, args.seed, args.on_disk)
+            output["results"][str(size)] = result
+            mismatches += sum(not r["identical"] for r in result.values())
+        if args.out:
+            with open(args.out, "w") as f:
+                json.dump(output, f, indent=2)
+        print(f"\n{'❌' if mismatches else '✅'} {mismatches} listing(s) differ from the schema output.")
+        return 1 if mismatches else 0
+
+    if args.search:
+        for size in sizes:
+            print(f"Dataset: {size:,} workouts")
+            output["results"][str(size)] = run_search(size, args.seed, args.on_disk)
+        if args.out:
+            with open(args.out, "w") as f:
+                json.dump(output, f, indent=2)
+        return 0
+
+    if args.compression:
+        for size in sizes:
+            print(f"Dataset: {size:,} workouts")
+            output["results"][str(size)] = run_compression(size, args.seed, args.on_disk)
+        if args.out:
+            with open(args.out, "w") as f:
+                json.dump(output, f, indent=2)
+        return 0
+
+    for size in sizes:
+        print(f"Dataset: {size:,} workouts")
+        output["results"][str(size)] = run_size(size, args.requests, args.seed, args.on_disk)
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(output, f, indent=2)
+        print(f"\nResults written to {args.out}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(json.load(f), output, args.threshold)
+        if regressions:
+            print("\n❌ Regressions:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print("\n✅ No regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
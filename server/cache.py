@@ -0,0 +1,166 @@
+"""In-process LRU caches of serialized response bodies, keyed by ETag and tagged with scopes."""
+
+import threading
+from collections import OrderedDict
+from functools import wraps
+
+from flask import current_app, g, make_response
+
+import compression
+from metrics import measure
+
+# Response headers worth replaying on a hit (pagination links, content type).
+KEPT_HEADERS = ("Content-Type", "X-Next-Cursor", "Link")
+
+
+class ResponseCache:
+    """A thread-safe LRU of response bodies, bounded by entry count and total bytes."""
+
+    def __init__(self, name, max_entries=1024, max_bytes=32 * 1024 * 1024, compress_levels=None):
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.compress_levels = compress_levels or {}  # overrides COMPRESS_LEVELS for kept bodies
+        self._entries = OrderedDict()   # key -> (body, headers, tags, {encoding: bytes})
+        self._by_tag = {}               # tag -> set(keys)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0], entry[1]
+
+    def put(self, key, body, headers, tags):
+        # A single body that would take over a quarter of the budget isn't worth keeping.
+        if len(body) > self.max_bytes // 4:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (body, headers, tuple(tags), {})
+            self._bytes += len(body)
+            for tag in tags:
+                self._by_tag.setdefault(tag, set()).add(key)
+            self._evict()
+
+    def variant(self, key, body, encoding, make):
+        """The entry's body in `encoding`, from `make()` the first time and kept with the entry."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and encoding in entry[3]:
+                return entry[3][encoding]
+        data = make()  # outside the lock; a concurrent miss just does it twice
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] is body and encoding not in entry[3]:
+                entry[3][encoding] = data
+                self._bytes += len(data)
+                self._evict()
+        return data
+
+    def _evict(self):
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def invalidate(self, *tags):
+        with self._lock:
+            for tag in tags:
+                for key in self._by_tag.pop(tag, ()):
+                    if key in self._entries:
+                        self._remove(key)
+                        self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_tag.clear()
+            self._bytes = 0
+
+    def _remove(self, key):
+        body, _, tags, variants = self._entries.pop(key)
+        self._bytes -= len(body) + sum(len(data) for data in variants.values())
+        for tag in tags:
+            keys = self._by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_tag[tag]
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+def init_app(app):
+    """Create the app's caches from RESPONSE_CACHES ({name: {max_entries, max_bytes, ...}})."""
+    app.extensions["response_caches"] = {
+        name: ResponseCache(name, **limits)
+        for name, limits in app.config["RESPONSE_CACHES"].items()
+    }
+
+
+def caches():
+    """The current app's caches."""
+    return current_app.extensions["response_caches"].values()
+
+
+def invalidate(*scopes):
+    """Drop entries tagged with any of `scopes` from every cache of the current app."""
+    for cache in caches():
+        cache.invalidate(*scopes)
+
+
+def cached(name):
+    """Serve a GET route's 200 response from the app's cache `name`; must sit inside `@conditional`."""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(**kwargs):
+            cache = current_app.extensions["response_caches"][name]
+            hit = cache.get(g.etag)
+            if hit is not None:
+                body, headers = hit
+                response = make_response(body, 200, headers)
+            else:
+                response = make_response(view(**kwargs))
+                if response.status_code != 200 or response.is_streamed:
+                    return response
+                body = response.get_data()
+                headers = {k: response.headers[k] for k in KEPT_HEADERS if k in response.headers}
+                cache.put(g.etag, body, headers, g.scopes)
+            encoding = compression.negotiate(response.mimetype, len(body))
+            if encoding:
+                level = current_app.config["COMPRESS_LEVELS"][encoding]
+                # Only a body that was kept is worth the slower, denser level.
+                if encoding in cache.compress_levels and g.etag in cache:
+                    level = cache.compress_levels[encoding]
+                data = cache.variant(
+                    g.etag, body, encoding,
+                    lambda: measure("compress", compression.compress, body, encoding, level),
+                )
+                compression.encode(response, data, encoding)
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,106 @@
+"""Response compression: gzip, and brotli when installed, negotiated from Accept-Encoding."""
+
+import zlib
+
+from flask import current_app, request
+
+from metrics import measure
+
+try:
+    import brotli
+except ImportError:  # optional: pip install brotli
+    brotli = None
+
+COMPRESSIBLE = ("application/json", "application/x-ndjson", "text/")
+
+
+def encodings():
+    """The encodings this process can produce, most preferred first."""
+    return ("br", "gzip") if brotli else ("gzip",)
+
+
+def compressible(mimetype):
+    return bool(mimetype) and mimetype.startswith(COMPRESSIBLE)
+
+
+def negotiate(mimetype, size=None):
+    """The encoding for a `mimetype` body of `size` bytes (None: streamed), or None to send it as is."""
+    if not compressible(mimetype):
+        return None
+    if size is not None and size < current_app.config["COMPRESS_MIN_SIZE"]:
+        return None
+    return request.accept_encodings.best_match(encodings())
+
+
+# ── Codecs ────────────────────────────────────────────────────────────────────
+def compressor(encoding, level):
+    """An object with compress(bytes) / flush() for one stream."""
+    if encoding == "gzip":
+        return zlib.compressobj(level, zlib.DEFLATED, 31)
+    return _BrotliStream(level)
+
+
+class _BrotliStream:
+    def __init__(self, quality):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data):
+        return self._compressor.process(data)
+
+    def flush(self):
+        return self._compressor.finish()
+
+
+def compress(data, encoding, level=None):
+    """`data` compressed with `encoding` at `level` (default: COMPRESS_LEVELS)."""
+    if level is None:
+        level = current_app.config["COMPRESS_LEVELS"][encoding]
+    if encoding == "br":
+        return brotli.compress(data, quality=level)
+    stream = compressor(encoding, level)
+    return stream.compress(data) + stream.flush()
+
+
+def compressed_stream(chunks, encoding, level):
+    """Compress an iterable of str/bytes chunks into one stream, chunk by chunk."""
+    stream = compressor(encoding, level)
+    for chunk in chunks:
+        data = stream.compress(chunk.encode() if isinstance(chunk, str) else chunk)
+        if data:
+            yield data
+    yield stream.flush()
+
+
+# ── Responses ─────────────────────────────────────────────────────────────────
+def encode(response, data, encoding):
+    """Make `data`, the body compressed with `encoding`, the response body."""
+    response.set_data(data)
+    response.headers["Content-Encoding"] = encoding
+
+
+def init_app(app):
+    """Compress the app's 200 responses of a compressible type once they reach COMPRESS_MIN_SIZE."""
+
+    @app.after_request
+    def compress_response(response):
+        if (
+            response.status_code != 200
+            or response.direct_passthrough
+            or not compressible(response.mimetype)
+        ):
+            return response
+        response.vary.add("Accept-Encoding")
+        if "Content-Encoding" in response.headers:  # already encoded by @cached
+            return response
+        if response.is_streamed:
+            encoding = negotiate(response.mimetype)
+            if encoding:
+                level = app.config["COMPRESS_LEVELS"][encoding]
+                response.response = compressed_stream(response.response, encoding, level)
+                response.headers["Content-Encoding"] = encoding
+            return response
+        body = response.get_data()
+        encoding = negotiate(response.mimetype, len(body))
+        if encoding:
+            encode(response, measure("compress", compress, body, encoding), encoding)
+        return response
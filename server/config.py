@@ -0,0 +1,64 @@
+"""Configuration classes for `create_app()`, picked by name or through APP_CONFIG."""
+
+import os
+
+from sqlalchemy.pool import StaticPool
+
+from database import sqlite_pragmas
+
+
+class Config:
+    SQLALCHEMY_DATABASE_URI = os.environ.get("DATABASE_URL", "sqlite:///app.db")
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # None: derive pool settings from the URL (database.engine_options)
+    SQLALCHEMY_ENGINE_OPTIONS = None
+    SQLITE_PRAGMAS = sqlite_pragmas()
+    METRICS_PUBLIC = os.environ.get("METRICS_PUBLIC", "0") not in ("0", "false", "no")
+    # Create missing tables at startup instead of relying on migrations.
+    CREATE_ALL = False
+
+    # In-process response caches; the exercise catalog is read far more
+    # often than it changes, and training-load reports are costly to build.
+    # Workout listings change on every write but are re-read in between.
+    RESPONSE_CACHES = {
+        "catalog": {"max_entries": 256, "max_bytes": 16 * 1024 * 1024, "compress_levels": {"br": 9}},
+        "exercises": {"max_entries": 2048, "max_bytes": 64 * 1024 * 1024},
+        "workouts": {"max_entries": 1024, "max_bytes": 64 * 1024 * 1024},
+        "load": {"max_entries": 256, "max_bytes": 32 * 1024 * 1024},
+    }
+
+    # Response compression (compression.py). Bodies under COMPRESS_MIN_SIZE
+    # bytes go out as is. Brotli 4 beats gzip 6 on both time and size. The
+    # exercise catalog rarely changes, so its cached copies are compressed once
+    # at brotli 9 (~10x the time); gzip 9 costs ~7x gzip 6 for ~7% fewer bytes.
+    # See `bench.py --compression`.
+    COMPRESS_MIN_SIZE = 1024
+    COMPRESS_LEVELS = {"gzip": 6, "br": 4}
+
+
+class DevelopmentConfig(Config):
+    DEBUG = True
+
+
+class ProductionConfig(Config):
+    DEBUG = False
+
+
+class TestingConfig(Config):
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = "sqlite://"
+    # One connection shared by every session, so all of them see the same
+    # in-memory database for the lifetime of the app.
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        "poolclass": StaticPool,
+        "connect_args": {"check_same_thread": False},
+    }
+    SQLITE_PRAGMAS = {"foreign_keys": "ON"}
+    CREATE_ALL = True
+
+
+CONFIGS = {
+    "development": DevelopmentConfig,
+    "production": ProductionConfig,
+    "testing": TestingConfig,
+}
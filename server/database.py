@@ -0,0 +1,74 @@
+"""Database engine configuration from the environment, with per-connection SQLite tuning."""
+
+import os
+import weakref
+
+from sqlalchemy import event
+
+
+def _env_int(environ, key, default):
+    value = environ.get(key)
+    return int(value) if value not in (None, "") else default
+
+
+def engine_options(url, environ=os.environ):
+    """SQLALCHEMY_ENGINE_OPTIONS for `url`."""
+    options = {"pool_pre_ping": not url.startswith("sqlite")}
+    if url.startswith("sqlite") and ":memory:" not in url and url != "sqlite://":
+        options["pool_size"] = _env_int(environ, "DB_POOL_SIZE", 10)
+        options["max_overflow"] = _env_int(environ, "DB_MAX_OVERFLOW", 20)
+    elif not url.startswith("sqlite"):
+        options["pool_size"] = _env_int(environ, "DB_POOL_SIZE", 5)
+        options["max_overflow"] = _env_int(environ, "DB_MAX_OVERFLOW", 10)
+    return options
+
+
+def sqlite_pragmas(environ=os.environ):
+    """
+    PRAGMAs applied to each new SQLite connection. foreign_keys stays on even
+    with tuning off: the ON DELETE CASCADE constraints depend on it.
+    """
+    if environ.get("SQLITE_TUNING", "1") in ("0", "false", "no"):
+        return {"foreign_keys": "ON"}
+    return {
+        "journal_mode": "WAL",
+        "busy_timeout": _env_int(environ, "SQLITE_BUSY_TIMEOUT_MS", 5000),
+        "synchronous": "NORMAL",
+        "foreign_keys": "ON",
+        # Negative cache_size is in KiB rather than pages.
+        "cache_size": -_env_int(environ, "SQLITE_CACHE_SIZE_KB", 64 * 1024),
+        "mmap_size": _env_int(environ, "SQLITE_MMAP_SIZE", 256 * 1024 * 1024),
+        "temp_store": "MEMORY",
+    }
+
+
+def configure_engine(engine, pragmas):
+    """Apply `pragmas` to every connection `engine` opens, if it is SQLite."""
+    if engine.dialect.name != "sqlite" or not pragmas:
+        return
+    in_memory = engine.url.database in (None, "", ":memory:")
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            # An in-memory database has no journal file to put in WAL mode.
+            if name == "journal_mode" and in_memory:
+                continue
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+def dispose_after_fork(engine):
+    """Give `engine` a fresh, empty pool in every child process forked after this."""
+    # A pre-fork server imports the app in the master; its pooled connections
+    # must not be shared by the workers.
+    ref = weakref.ref(engine)
+
+    def reset_pool():
+        engine = ref()
+        if engine is not None:
+            # close=False: the parent still owns those connections; just forget them.
+            engine.dispose(close=False)
+
+    os.register_at_fork(after_in_child=reset_pool)
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Query-plan check: exits non-zero if a route's SQL fully scans a large table.
+
+Run from the server/ directory:
+    python explain.py [--workouts 20000] [--exercises 200]
+"""
+
+import argparse
+import sys
+
+from sqlalchemy import event, text
+
+from app import create_app
+from models import db
+from seed import generate
+
+# Tables big enough that a full scan on a request path is a bug.
+LARGE_TABLES = {"workouts", "workout_exercises"}
+
+
+# ── Synthetic data ────────────────────────────────────────────────────────────
+def populate(n_exercises, n_workouts, per_workout=5):
+    generate(n_exercises, n_workouts, n_workouts * per_workout)
+    db.session.execute(text("ANALYZE"))
+    db.session.commit()
+
+
+# ── Route calls to check ──────────────────────────────────────────────────────
+def route_calls(client):
+    """Yield (label, callable) pairs; each callable issues one request."""
+    first = client.get("/workouts?limit=20")
+    cursor = first.headers.get("X-Next-Cursor")
+    ex_first = client.get("/exercises?limit=20")
+    ex_cursor = ex_first.headers.get("X-Next-Cursor")
+
+    yield "GET /workouts", lambda: client.get("/workouts?limit=20")
+    yield "GET /workouts (page 2)", lambda: client.get(f"/workouts?limit=20&cursor={cursor}")
+    yield "GET /workouts?exercise_id", lambda: client.get("/workouts?limit=20&exercise_id=5")
+    yield "GET /workouts?category", lambda: client.get(
+        "/workouts?limit=20&category=strength&equipment_needed=false")
+    yield "GET /workouts?from&to", lambda: client.get(
+        "/workouts?limit=20&from=2016-01-01&to=2016-03-31&min_duration=60")
+    yield "GET /workouts/<id>", lambda: client.get("/workouts/1")
+    yield "GET /search", lambda: client.get("/search?q=deadlift&limit=20")
+    yield "GET /search?type=exercises", lambda: client.get("/search?type=exercises&q=bench&limit=20")
+    yield "GET /exercises", lambda: client.get("/exercises?limit=20")
+    yield "GET /exercises (page 2)", lambda: client.get(f"/exercises?limit=20&cursor={ex_cursor}")
+    yield "GET /exercises/<id>", lambda: client.get("/exercises/1")
+    yield "GET /exercises/<id>/records", lambda: client.get("/exercises/1/records")
+    yield "GET /analytics/load", lambda: client.get("/analytics/load?from=2016-01-01&to=2018-12-31")
+    yield "POST /workouts", lambda: client.post(
+        "/workouts", json={"date": "2024-06-01", "duration_minutes": 30})
+    yield "POST /exercises", lambda: client.post(
+        "/exercises", json={"name": "Explain Check", "category": "other"})
+    yield "POST .../workout_exercises", lambda: client.post(
+        "/workouts/2/exercises/2/workout_exercises", json={"sets": 3, "reps": 5})
+    yield "PUT /workouts/<id>/exercises", lambda: client.put(
+        "/workouts/2/exercises", json=[{"exercise_id": 2, "sets": 4, "reps": 5}, {"exercise_id": 6, "sets": 1}])
+    yield "DELETE /workouts/<id>", lambda: client.delete("/workouts/3")
+    yield "DELETE /exercises/<id>", lambda: client.delete("/exercises/4")
+    yield "DELETE /workouts?from&to", lambda: client.delete("/workouts?from=2017-01-01&to=2017-01-31")
+
+
+def capture(engine, fn):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if not executemany:
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        fn()
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    return statements
+
+
+def full_scans(plan_rows):
+    """Plan details that read a large table without an index."""
+    bad = []
+    for row in plan_rows:
+        detail = row[-1]
+        words = detail.split()
+        if len(words) >= 2 and words[0] == "SCAN" and words[1] in LARGE_TABLES:
+            if "INDEX" not in detail:
+                bad.append(detail)
+    return bad
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--workouts", type=int, default=20000)
+    parser.add_argument("--exercises", type=int, default=200)
+    args = parser.parse_args()
+
+    failures = 0
+    app = create_app("testing")
+    with app.app_context():
+        print(f"Populating {args.exercises} exercises / {args.workouts} workouts...")
+        populate(args.exercises, args.workouts)
+
+        client = app.test_client()
+        engine = db.engine
+        for label, call in route_calls(client):
+            statements = capture(engine, call)
+            print(f"\n{label}")
+            for statement, params in statements:
+                if not statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE", "INSERT INTO PERSONAL_RECORDS")):
+                    continue
+                with engine.connect() as conn:
+                    plan = conn.exec_driver_sql(
+                        f"EXPLAIN QUERY PLAN {statement}", params
+                    ).fetchall()
+                bad = full_scans(plan)
+                failures += len(bad)
+                flag = "FULL SCAN" if bad else "ok"
+                print(f"  [{flag}] {' '.join(statement.split())[:100]}")
+                for row in plan:
+                    print(f"      {row[-1]}")
+
+    print(f"\n{'❌' if failures else '✅'} {failures} full scan(s) on large tables.")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+"""Sparse fieldsets for the read routes: `?fields=` and `?include=` select what is queried and serialized."""
+
+from collections import namedtuple
+
+from schemas import WorkoutSchema, ExerciseSchema
+
+Fieldset = namedtuple("Fieldset", "fields includes")
+
+
+class Resource:
+    """
+    The selectable attributes and relationships of one resource.
+    `includes` maps include names to dotted schema paths; a nested path implies its parent.
+    """
+
+    def __init__(self, schema_class, fields, includes):
+        self.schema_class = schema_class
+        self.fields = fields
+        self.includes = includes
+        self.full = Fieldset(fields, frozenset(includes))
+        self._schemas = {}
+
+    def parse(self, args):
+        """The Fieldset requested by `args`. Raises ValueError for unknown names."""
+        fields = self.fields
+        if "fields" in args:
+            wanted = _names(args["fields"])
+            unknown = wanted - set(self.fields)
+            if unknown:
+                raise ValueError(
+                    f"Unknown field(s) {', '.join(sorted(unknown))}; "
+                    f"'fields' accepts: {', '.join(self.fields)}."
+                )
+            fields = tuple(f for f in self.fields if f == "id" or f in wanted)
+
+        includes = self.full.includes
+        if "include" in args:
+            wanted = _names(args["include"])
+            unknown = wanted - set(self.includes)
+            if unknown:
+                raise ValueError(
+                    f"Unknown include(s) {', '.join(sorted(unknown))}; "
+                    f"'include' accepts: {', '.join(self.includes)}."
+                )
+            includes = frozenset(
+                name for name, path in self.includes.items()
+                if any(self.includes[w] == path or self.includes[w].startswith(path + ".") for w in wanted)
+            )
+        return Fieldset(fields, includes)
+
+    def schema(self, fieldset):
+        """A schema instance that dumps exactly `fieldset` (built once per shape)."""
+        schema = self._schemas.get(fieldset)
+        if schema is None:
+            exclude = [f for f in self.fields if f not in fieldset.fields]
+            exclude += [
+                path for name, path in self.includes.items()
+                if name not in fieldset.includes
+                # Excluding a parent already drops everything beneath it.
+                and not any(
+                    path.startswith(other + ".") for n, other in self.includes.items()
+                    if n not in fieldset.includes
+                )
+            ]
+            schema = self._schemas[fieldset] = self.schema_class(exclude=exclude)
+        return schema
+
+
+def _names(value):
+    return {name.strip() for name in value.split(",") if name.strip()}
+
+
+WORKOUT_FIELDS = Resource(
+    WorkoutSchema,
+    fields=("id", "date", "duration_minutes", "notes"),
+    includes={"workout_exercises": "workout_exercises", "exercise": "workout_exercises.exercise"},
+)
+EXERCISE_FIELDS = Resource(
+    ExerciseSchema,
+    fields=("id", "name", "category", "equipment_needed"),
+    includes={"workouts": "workouts"},
+)
@@ -0,0 +1,68 @@
+"""Server-side filters for `GET /workouts` (date, duration and exercise-entry conditions)."""
+
+from datetime import date
+
+from models import db, Exercise, Workout, WorkoutExercise
+
+BOOLEANS = {"true": True, "1": True, "false": False, "0": False}
+
+
+def _parse(args, key, parser, message):
+    value = args.get(key)
+    if value in (None, ""):
+        return None
+    try:
+        return parser(value)
+    except ValueError:
+        raise ValueError(f"'{key}' must be {message}.")
+
+
+def _boolean(value):
+    if value.lower() not in BOOLEANS:
+        raise ValueError(value)
+    return BOOLEANS[value.lower()]
+
+
+def workout_filters(args):
+    """
+    SQL conditions on Workout for the filters in `args`.
+    Raises ValueError with a client-facing message.
+    """
+    start = _parse(args, "from", date.fromisoformat, "a date (YYYY-MM-DD)")
+    end = _parse(args, "to", date.fromisoformat, "a date (YYYY-MM-DD)")
+    min_duration = _parse(args, "min_duration", int, "an integer")
+    max_duration = _parse(args, "max_duration", int, "an integer")
+    exercise_id = _parse(args, "exercise_id", int, "an integer")
+    category = _parse(args, "category", lambda v: v.strip().lower(), "a category")
+    equipment = _parse(args, "equipment_needed", _boolean, "true or false")
+
+    conditions = []
+    if start is not None:
+        conditions.append(Workout.date >= start)
+    if end is not None:
+        conditions.append(Workout.date <= end)
+    if min_duration is not None:
+        conditions.append(Workout.duration_minutes >= min_duration)
+    if max_duration is not None:
+        conditions.append(Workout.duration_minutes <= max_duration)
+
+    # The exercise-level filters describe one entry: category=strength&
+    # equipment_needed=false is a bodyweight strength exercise.
+    we = WorkoutExercise
+    entry = []
+    if exercise_id is not None:
+        entry.append(we.exercise_id == exercise_id)
+    if category is not None:
+        entry.append(Exercise.category == category)
+    if equipment is not None:
+        entry.append(Exercise.equipment_needed == equipment)
+    if category is not None or equipment is not None:
+        entry.append(Exercise.id == we.exercise_id)
+
+    # exercise_id is selective: find its workouts from the (exercise_id, workout_id)
+    # index. Category and equipment match most workouts: probe each one instead.
+    if exercise_id is not None:
+        conditions.append(Workout.id.in_(db.select(we.workout_id).where(*entry)))
+    elif entry:
+        conditions.append(db.exists().where(we.workout_id == Workout.id, *entry))
+    return conditions
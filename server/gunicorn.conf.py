@@ -0,0 +1,30 @@
+"""
+gunicorn settings for the production entry point; each can be overridden from the environment.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+"""
+
+import multiprocessing
+import os
+
+bind = os.environ.get("BIND", "0.0.0.0:5555")
+
+# Pre-fork workers: one process per core is plenty when most time is spent in
+# SQLite and JSON encoding; a couple of threads each cover I/O waits.
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+threads = int(os.environ.get("GUNICORN_THREADS", 2))
+
+# Import the app once in the master so workers fork with it already loaded
+# (less memory, faster restarts). The engine's pool is reset in each child by
+# database.dispose_after_fork, so no connection is shared across processes.
+preload_app = True
+
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 30))
+graceful_timeout = 30
+keepalive = 5
+# Recycle workers now and then to cap slow memory growth.
+max_requests = 10000
+max_requests_jitter = 1000
+
+accesslog = "-"
+errorlog = "-"
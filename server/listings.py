@@ -0,0 +1,157 @@
+"""Column-level read path for the listings: plain rows, dumped byte-identical to the schemas."""
+
+import json
+
+from fieldsets import WORKOUT_FIELDS, EXERCISE_FIELDS
+from metrics import measure
+from models import db, Exercise, Workout, WorkoutExercise
+
+# Keep IN lists under SQLite's bound-parameter limit.
+IN_CHUNK = 900
+
+# Columns the paginated listing queries select; the keyset columns are included.
+WORKOUT_COLUMNS = (Workout.id, Workout.date, Workout.duration_minutes, Workout.notes)
+EXERCISE_COLUMNS = (Exercise.id, Exercise.name, Exercise.category, Exercise.equipment_needed)
+
+# Keyset sort columns, selected whatever `?fields=` asks for.
+WORKOUT_SORT = ("id", "date")
+EXERCISE_SORT = ("id", "name")
+
+
+def columns(all_columns, fieldset, sort):
+    """The subset of `all_columns` a listing with `fieldset` needs to select."""
+    return tuple(c for c in all_columns if c.key in fieldset.fields or c.key in sort)
+
+
+def _chunks(ids):
+    for start in range(0, len(ids), IN_CHUNK):
+        yield ids[start:start + IN_CHUNK]
+
+
+def _iso(value):
+    return value.isoformat() if value is not None else None
+
+
+def _scalars(row, fields):
+    item = {name: getattr(row, name) for name in fields}
+    if "date" in item:
+        item["date"] = _iso(item["date"])
+    return item
+
+
+# ── Workouts ──────────────────────────────────────────────────────────────────
+# Nested collections come in primary-key order, like the relationships' order_by.
+def workout_dicts(rows, fieldset=WORKOUT_FIELDS.full):
+    """Turn WORKOUT_COLUMNS rows into WorkoutSchema dicts shaped by `fieldset`."""
+    out = [_scalars(row, fieldset.fields) for row in rows]
+    if "workout_exercises" not in fieldset.includes:
+        return out
+    by_id = {}
+    for row, item in zip(rows, out):
+        item["workout_exercises"] = by_id[row.id] = []
+
+    we, ex = WorkoutExercise, Exercise
+    with_exercise = "exercise" in fieldset.includes
+    entry_columns = (we.workout_id, we.id, we.exercise_id, we.reps, we.sets, we.duration_seconds)
+    for ids in _chunks(list(by_id)):
+        if with_exercise:
+            stmt = (
+                db.select(*entry_columns, ex.name, ex.category, ex.equipment_needed)
+                .join(ex, ex.id == we.exercise_id)
+            )
+        else:
+            stmt = db.select(*entry_columns)
+        nested = db.session.execute(
+            stmt.where(we.workout_id.in_(ids)).order_by(we.workout_id, we.id)
+        )
+        for workout_id, we_id, exercise_id, reps, sets, duration, *exercise in nested:
+            entry = {
+                "id": we_id,
+                "workout_id": workout_id,
+                "exercise_id": exercise_id,
+                "reps": reps,
+                "sets": sets,
+                "duration_seconds": duration,
+            }
+            if with_exercise:
+                name, category, equipment = exercise
+                entry["exercise"] = {
+                    "id": exercise_id,
+                    "name": name,
+                    "category": category,
+                    "equipment_needed": equipment,
+                }
+            by_id[workout_id].append(entry)
+    return out
+
+
+def dump_workouts(rows, fieldset=WORKOUT_FIELDS.full):
+    return measure("ser", json.dumps, workout_dicts(rows, fieldset))
+
+
+# ── Exercises ─────────────────────────────────────────────────────────────────
+def exercise_dicts(rows, fieldset=EXERCISE_FIELDS.full):
+    """Turn EXERCISE_COLUMNS rows into ExerciseSchema dicts shaped by `fieldset`."""
+    out = [_scalars(row, fieldset.fields) for row in rows]
+    if "workouts" not in fieldset.includes:
+        return out
+    by_id = {}
+    for row, item in zip(rows, out):
+        item["workouts"] = by_id[row.id] = []
+
+    we, w = WorkoutExercise, Workout
+    for ids in _chunks(list(by_id)):
+        nested = db.session.execute(
+            db.select(we.exercise_id, w.id, w.date, w.duration_minutes, w.notes)
+            .join(w, w.id == we.workout_id)
+            .where(we.exercise_id.in_(ids))
+            .order_by(we.exercise_id, w.id)
+        )
+        for exercise_id, workout_id, day, duration, notes in nested:
+            by_id[exercise_id].append({
+                "id": workout_id,
+                "date": _iso(day),
+                "duration_minutes": duration,
+                "notes": notes,
+            })
+    return out
+
+
+def dump_exercises(rows, fieldset=EXERCISE_FIELDS.full):
+    return measure("ser", json.dumps, exercise_dicts(rows, fieldset))
+
+
+# ── Streaming ─────────────────────────────────────────────────────────────────
+STREAM_FORMATS = {
+    "json": "application/json",
+    "ndjson": "application/x-ndjson",
+}
+STREAM_CHUNK = 1000
+
+
+def stream(query, keyset, to_dicts, fmt, chunk_size=STREAM_CHUNK):
+    """
+    Yield an entire listing as `fmt` text ("json" array or "ndjson" lines),
+    `chunk_size` rows per round trip, holding one chunk in memory at a time.
+    """
+    ordered = query.order_by(*keyset.order_by())
+    last, first = None, True
+    if fmt == "json":
+        yield "["
+    while True:
+        page = ordered.filter(keyset.seek(last)) if last else ordered
+        rows = page.limit(chunk_size).all()
+        if not rows:
+            break
+        items = to_dicts(rows)
+        if fmt == "json":
+            body = ", ".join(json.dumps(item) for item in items)
+            yield body if first else ", " + body
+        else:
+            yield "".join(json.dumps(item) + "\n" for item in items)
+        first = False
+        last = keyset.values(rows[-1])
+        if len(rows) < chunk_size:
+            break
+    if fmt == "json":
+        yield "]"
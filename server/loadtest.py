@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Concurrent load test: exits non-zero on any "database is locked" error or other 5xx.
+
+Run from the server/ directory:
+    python loadtest.py --readers 8 --writers 4 --seconds 10
+    python loadtest.py --untuned      # same run with SQLite's default settings
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Concurrent read/write load test.")
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--workouts", type=int, default=5000, help="dataset size")
+    parser.add_argument("--untuned", action="store_true",
+                        help="disable the SQLite pragmas (SQLITE_TUNING=0) for comparison")
+    return parser.parse_args()
+
+
+args = parse_args()
+_tmpdir = tempfile.mkdtemp(prefix="loadtest-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmpdir, 'loadtest.db')}"
+if args.untuned:
+    os.environ["SQLITE_TUNING"] = "0"
+
+from app import create_app  # noqa: E402
+from models import db  # noqa: E402
+from seed import generate  # noqa: E402
+
+EXERCISES = 100
+
+app = create_app("production")
+results_lock = threading.Lock()
+
+
+def reader(client, rng, n_workouts):
+    choice = rng.random()
+    if choice < 0.4:
+        return "GET /workouts", client.get("/workouts?limit=20")
+    if choice < 0.7:
+        return "GET /workouts/<id>", client.get(f"/workouts/{rng.randint(1, n_workouts)}")
+    if choice < 0.9:
+        return "GET /exercises/<id>", client.get(f"/exercises/{rng.randint(1, EXERCISES)}")
+    return "GET /analytics/volume", client.get("/analytics/volume?period=month")
+
+
+def writer(client, rng, n_workouts):
+    choice = rng.random()
+    if choice < 0.5:
+        response = client.post("/workouts", json={
+            "date": f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            "duration_minutes": rng.randint(15, 120),
+        })
+        if response.status_code == 201:
+            # The pair succeeds or fails with its second request
+            response = client.post(
+                f"/workouts/{response.get_json()['id']}/exercises/"
+                f"{rng.randint(1, EXERCISES)}/workout_exercises",
+                json={"sets": 3, "reps": 8},
+            )
+        return "POST /workouts + exercise", response
+    return "POST /workouts/batch", client.post("/workouts/batch", json=[
+        {
+            "date": "2024-06-01", "duration_minutes": 45,
+            "workout_exercises": [
+                {"exercise_id": e, "sets": 3, "reps": 8}
+                for e in rng.sample(range(1, EXERCISES + 1), 4)
+            ],
+        }
+        for _ in range(5)
+    ])
+
+
+def run_thread(kind, seed, deadline, n_workouts, results, failures):
+    client = app.test_client()
+    rng = random.Random(seed)
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            name, response = kind(client, rng, n_workouts)
+            status = response.status_code
+            detail = response.get_data(as_text=True)[:200] if status >= 500 else ""
+        except Exception as err:  # a lock error escaping the route
+            name, status, detail = kind.__name__, 500, str(err)
+        elapsed = time.perf_counter() - start
+        with results_lock:
+            results[name].append(elapsed)
+            if status >= 500:
+                failures["database is locked" if "locked" in detail else f"HTTP {status}"] += 1
+
+
+def main():
+    with app.app_context():
+        db.create_all()
+        generate(EXERCISES, args.workouts, args.workouts * 4)
+        print(f"journal_mode={db.session.execute(db.text('PRAGMA journal_mode')).scalar()}")
+
+    results, failures = defaultdict(list), Counter()
+    deadline = time.perf_counter() + args.seconds
+    threads = [
+        threading.Thread(target=run_thread, args=(reader, i, deadline, args.workouts, results, failures))
+        for i in range(args.readers)
+    ] + [
+        threading.Thread(target=run_thread, args=(writer, 1000 + i, deadline, args.workouts, results, failures))
+        for i in range(args.writers)
+    ]
+    print(f"Running {args.readers} readers + {args.writers} writers for {args.seconds:g}s...")
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for name, latencies in sorted(results.items()):
+        latencies.sort()
+        p95 = latencies[int(len(latencies) * 0.95) - 1] if latencies else 0
+        print(f"  {name:<28} {len(latencies):>6} req  {len(latencies) / args.seconds:>8.1f} req/s  "
+              f"p95={p95 * 1000:.1f}ms")
+
+    if failures:
+        print("\n❌ Failures:")
+        for reason, count in failures.most_common():
+            print(f"  {reason}: {count}")
+        return 1
+    print("\n✅ No lock errors or server errors.")
+    return 0
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    finally:
+        shutil.rmtree(_tmpdir, ignore_errors=True)
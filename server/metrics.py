@@ -0,0 +1,198 @@
+"""Per-request timings, sent as a Server-Timing header and kept as per-route Prometheus histograms."""
+
+import threading
+import time
+from collections import defaultdict
+
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+# Upper bounds (seconds) shared by every histogram.
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+QUERY_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100)
+
+# Timed phases besides "total"; cheap enough (perf_counter calls) to stay on in production.
+PHASES = ("db", "ser", "commit", "compress")
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Registry:
+    """Per-route histograms and request counters, guarded by one lock."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.durations = defaultdict(lambda: Histogram(BUCKETS))
+        self.phases = defaultdict(lambda: Histogram(BUCKETS))
+        self.queries = defaultdict(lambda: Histogram(QUERY_BUCKETS))
+        self.requests = defaultdict(int)
+
+    def record(self, route, method, status, total, timings, query_count):
+        with self._lock:
+            self.requests[(route, method, str(status))] += 1
+            self.durations[(route, method)].observe(total)
+            self.queries[(route, method)].observe(query_count)
+            for phase in PHASES:
+                self.phases[(route, method, phase)].observe(timings[phase])
+
+    def render(self, extra=()):
+        """The registry in Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            lines += [
+                "# HELP http_requests_total Requests handled, by route, method and status.",
+                "# TYPE http_requests_total counter",
+            ]
+            for (route, method, status), n in sorted(self.requests.items()):
+                lines.append(
+                    f'http_requests_total{{route="{route}",method="{method}",status="{status}"}} {n}'
+                )
+            lines += _histogram_lines(
+                "http_request_duration_seconds", "Total request time.",
+                self.durations, ("route", "method"),
+            )
+            lines += _histogram_lines(
+                "http_request_phase_seconds", "Time per phase (db, ser, commit, compress).",
+                self.phases, ("route", "method", "phase"),
+            )
+            lines += _histogram_lines(
+                "http_request_db_queries", "SQL statements issued per request.",
+                self.queries, ("route", "method"),
+            )
+        lines += extra
+        return "\n".join(lines) + "\n"
+
+
+def _histogram_lines(name, help_text, histograms, label_names):
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+    for labels, hist in sorted(histograms.items()):
+        base = ",".join(f'{k}="{v}"' for k, v in zip(label_names, labels))
+        cumulative = 0
+        for bound, n in zip(hist.buckets, hist.counts):
+            cumulative += n
+            lines.append(f'{name}_bucket{{{base},le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{base},le="+Inf"}} {hist.count}')
+        lines.append(f"{name}_sum{{{base}}} {hist.sum:.6f}")
+        lines.append(f"{name}_count{{{base}}} {hist.count}")
+    return lines
+
+
+def registry():
+    """The current app's Registry."""
+    return current_app.extensions["metrics"]
+
+
+# ResponseCache.stats() keys exported as counters and gauges.
+CACHE_COUNTERS = ("hits", "misses", "evictions", "invalidations")
+CACHE_GAUGES = ("entries", "bytes")
+
+
+def cache_lines(caches):
+    """Prometheus lines for the response caches' counters and occupancy."""
+    stats = [(cache.name, cache.stats()) for cache in caches]
+    lines = []
+    for key in CACHE_COUNTERS:
+        lines += [f"# TYPE response_cache_{key}_total counter"]
+        lines += [f'response_cache_{key}_total{{cache="{name}"}} {s[key]}' for name, s in stats]
+    for key in CACHE_GAUGES:
+        lines += [f"# TYPE response_cache_{key} gauge"]
+        lines += [f'response_cache_{key}{{cache="{name}"}} {s[key]}' for name, s in stats]
+    return lines
+
+
+# ── Per-request accounting ────────────────────────────────────────────────────
+def _timings():
+    if not has_request_context():
+        return None
+    return g.get("_timings")
+
+
+def measure(phase, fn, *args, **kwargs):
+    """Call `fn` and add its duration to the current request's `phase`."""
+    timings = _timings()
+    if timings is None:
+        return fn(*args, **kwargs)
+    start = time.perf_counter()
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        timings[phase] += time.perf_counter() - start
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # On the execution context, so a statement that raises leaves nothing behind
+    context._query_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = context._query_start
+    timings = _timings()
+    if timings is not None:
+        timings["db"] += time.perf_counter() - started
+        timings["queries"] += 1
+
+
+def _before_commit(session):
+    timings = _timings()
+    if timings is not None:
+        timings["_commit_start"] = time.perf_counter()
+
+
+def _after_commit(session):
+    timings = _timings()
+    if timings is not None and "_commit_start" in timings:
+        timings["commit"] += time.perf_counter() - timings.pop("_commit_start")
+
+
+def server_timing(timings, total):
+    return ", ".join([
+        f'db;dur={timings["db"] * 1000:.2f};desc="{timings["queries"]} queries"',
+        f'ser;dur={timings["ser"] * 1000:.2f}',
+        f'commit;dur={timings["commit"] * 1000:.2f}',
+        f'compress;dur={timings["compress"] * 1000:.2f}',
+        f"total;dur={total * 1000:.2f}",
+    ])
+
+
+def init_app(app, engine):
+    """Hook request timing into `app` and query timing into `engine`."""
+    app.extensions["metrics"] = Registry()
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    # Session events are global; every app shares the one pair of listeners.
+    if not event.contains(Session, "before_commit", _before_commit):
+        event.listen(Session, "before_commit", _before_commit)
+        event.listen(Session, "after_commit", _after_commit)
+
+    @app.before_request
+    def start_timer():
+        g._timings = {"db": 0.0, "ser": 0.0, "commit": 0.0, "compress": 0.0, "queries": 0}
+        g._request_start = time.perf_counter()
+
+    @app.after_request
+    def record_timings(response):
+        timings = g.pop("_timings", None)
+        if timings is None:
+            return response
+        total = time.perf_counter() - g.pop("_request_start")
+        response.headers["Server-Timing"] = server_timing(timings, total)
+        route = request.url_rule.rule if request.url_rule else "<unmatched>"
+        app.extensions["metrics"].record(route, request.method, response.status_code, total, timings, timings["queries"])
+        return response
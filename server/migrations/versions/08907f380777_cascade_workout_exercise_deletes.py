@@ -0,0 +1,39 @@
+"""cascade workout exercise deletes in the database
+
+Revision ID: 08907f380777
+Revises: de8aa6250fb0
+Create Date: 2026-10-16 23:05:12.417203
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '08907f380777'
+down_revision = 'de8aa6250fb0'
+branch_labels = None
+depends_on = None
+
+# The original foreign keys were created unnamed; this names them as the
+# batch rebuild reflects the table, so they can be dropped and recreated.
+NAMING = {"fk": "fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s"}
+
+FOREIGN_KEYS = (
+    ('fk_workout_exercises_workout_id_workouts', 'workouts', 'workout_id'),
+    ('fk_workout_exercises_exercise_id_exercises', 'exercises', 'exercise_id'),
+)
+
+
+def upgrade():
+    with op.batch_alter_table('workout_exercises', schema=None, naming_convention=NAMING) as batch_op:
+        for name, referent, column in FOREIGN_KEYS:
+            batch_op.drop_constraint(name, type_='foreignkey')
+            batch_op.create_foreign_key(name, referent, [column], ['id'], ondelete='CASCADE')
+
+
+def downgrade():
+    with op.batch_alter_table('workout_exercises', schema=None, naming_convention=NAMING) as batch_op:
+        for name, referent, column in FOREIGN_KEYS:
+            batch_op.drop_constraint(name, type_='foreignkey')
+            batch_op.create_foreign_key(name, referent, [column], ['id'])
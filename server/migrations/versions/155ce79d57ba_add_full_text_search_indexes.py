@@ -0,0 +1,58 @@
+"""add full-text search indexes on exercise names and workout notes
+
+Revision ID: 155ce79d57ba
+Revises: cda72fe22f0c
+Create Date: 2026-10-16 23:31:40.118265
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '155ce79d57ba'
+down_revision = 'cda72fe22f0c'
+branch_labels = None
+depends_on = None
+
+# (base table, indexed column). FTS5 is SQLite-only; on other databases
+# search.py falls back to LIKE and this migration does nothing.
+INDEXED = (
+    ('exercises', 'name'),
+    ('workouts', 'notes'),
+)
+
+
+def _statements(source, column):
+    fts = f'{source}_fts'
+    return [
+        f"CREATE VIRTUAL TABLE {fts} USING fts5("
+        f"{column}, content='{source}', content_rowid='id', "
+        f"tokenize='porter unicode61', prefix='2 3')",
+        f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {source} BEGIN "
+        f"INSERT INTO {fts}(rowid, {column}) VALUES (new.id, new.{column}); END",
+        f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {source} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {column}) VALUES ('delete', old.id, old.{column}); END",
+        f"CREATE TRIGGER {fts}_au AFTER UPDATE OF {column} ON {source} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {column}) VALUES ('delete', old.id, old.{column}); "
+        f"INSERT INTO {fts}(rowid, {column}) VALUES (new.id, new.{column}); END",
+        # Index the rows that already exist
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+    ]
+
+
+def upgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for source, column in INDEXED:
+        for statement in _statements(source, column):
+            op.execute(statement)
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for source, _ in INDEXED:
+        for suffix in ('ai', 'ad', 'au'):
+            op.execute(f'DROP TRIGGER IF EXISTS {source}_fts_{suffix}')
+        op.execute(f'DROP TABLE IF EXISTS {source}_fts')
@@ -15,10 +15,12 @@ class Exercise(db.Model):
 
     # ── Relationships ─────────────────────────────────────────────────────────
     workout_exercises = db.relationship(
-        "WorkoutExercise", back_populates="exercise", cascade="all, delete-orphan"
+        "WorkoutExercise", back_populates="exercise", cascade="all, delete-orphan",
+        passive_deletes=True,
     )
     workouts = db.relationship(
-        "Workout", secondary="workout_exercises", back_populates="exercises", viewonly=True
+        "Workout", secondary="workout_exercises", back_populates="exercises", viewonly=True,
+        order_by="Workout.id",
     )
 
     # ── Model Validations ─────────────────────────────────────────────────────
@@ -56,13 +58,14 @@ class Workout(db.Model):
     __tablename__ = "workouts"
 
     id = db.Column(db.Integer, primary_key=True)
-    date = db.Column(db.Date, nullable=False)
+    date = db.Column(db.Date, nullable=False, index=True)
     duration_minutes = db.Column(db.Integer, nullable=False)
     notes = db.Column(db.Text, nullable=True)
 
     # ── Relationships ─────────────────────────────────────────────────────────
     workout_exercises = db.relationship(
-        "WorkoutExercise", back_populates="workout", cascade="all, delete-orphan"
+        "WorkoutExercise", back_populates="workout", cascade="all, delete-orphan",
+        order_by="WorkoutExercise.id", passive_deletes=True,
     )
     exercises = db.relationship(
         "Exercise", secondary="workout_exercises", back_populates="workouts", viewonly=True
@@ -97,11 +100,18 @@ class WorkoutExercise(db.Model):
     __tablename__ = "workout_exercises"
 
     id = db.Column(db.Integer, primary_key=True)
+    # Deleting a workout or exercise removes its entries in the database itself
+    # (ON DELETE CASCADE); the relationships use passive_deletes so the ORM
+    # doesn't load the entries just to delete them one by one.
     workout_id = db.Column(
-        db.Integer, db.ForeignKey("workouts.id"), nullable=False
+        db.Integer,
+        db.ForeignKey("workouts.id", name="fk_workout_exercises_workout_id_workouts", ondelete="CASCADE"),
+        nullable=False,
     )
     exercise_id = db.Column(
-        db.Integer, db.ForeignKey("exercises.id"), nullable=False
+        db.Integer,
+        db.ForeignKey("exercises.id", name="fk_workout_exercises_exercise_id_exercises", ondelete="CASCADE"),
+        nullable=False,
     )
     reps = db.Column(db.Integer, nullable=True)
     sets = db.Column(db.Integer, nullable=True)
@@ -114,6 +124,8 @@ class WorkoutExercise(db.Model):
             "workout_id", "exercise_id",
             name="uq_workout_exercise"
         ),
+        # The reverse direction: an exercise's workouts, without touching the table
+        db.Index("ix_workout_exercises_exercise_workout", "exercise_id", "workout_id"),
     )
 
     # ── Relationships ─────────────────────────────────────────────────────────
@@ -144,3 +156,93 @@ class WorkoutExercise(db.Model):
             f"<WorkoutExercise workout_id={self.workout_id} "
             f"exercise_id={self.exercise_id} sets={self.sets} reps={self.reps}>"
         )
+
+
+# ── Daily Rollups ─────────────────────────────────────────────────────────────
+class DailyWorkoutRollup(db.Model):
+    """Workouts logged, minutes trained and volume per day. Maintained by analytics.py."""
+    __tablename__ = "daily_workout_rollups"
+
+    day = db.Column(db.Date, primary_key=True)
+    workouts = db.Column(db.Integer, nullable=False, default=0)
+    duration_minutes = db.Column(db.Integer, nullable=False, default=0)
+    # sets × reps over every entry of the day
+    volume = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<DailyWorkoutRollup day={self.day} workouts={self.workouts}>"
+
+
+class DailyExerciseRollup(db.Model):
+    """Per-exercise training totals per day. Maintained by analytics.py."""
+    __tablename__ = "daily_exercise_rollups"
+
+    day = db.Column(db.Date, primary_key=True)
+    exercise_id = db.Column(db.Integer, primary_key=True)
+    sessions = db.Column(db.Integer, nullable=False, default=0)
+    total_sets = db.Column(db.Integer, nullable=False, default=0)
+    total_reps = db.Column(db.Integer, nullable=False, default=0)
+    volume = db.Column(db.Integer, nullable=False, default=0)
+    time_under_tension_seconds = db.Column(db.Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        db.Index("ix_daily_exercise_rollups_exercise_day", "exercise_id", "day"),
+    )
+
+    def __repr__(self):
+        return (
+            f"<DailyExerciseRollup day={self.day} exercise_id={self.exercise_id} "
+            f"sessions={self.sessions}>"
+        )
+
+
+# ── Personal Records ──────────────────────────────────────────────────────────
+class PersonalRecord(db.Model):
+    """
+    An exercise's best entry for one kind of record ("reps", "volume",
+    "duration_seconds"), with the workout and day it was set. Maintained by
+    records.py; at most three rows per exercise.
+    """
+    __tablename__ = "personal_records"
+
+    exercise_id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(20), primary_key=True)
+    value = db.Column(db.Integer, nullable=False)
+    day = db.Column(db.Date, nullable=False)
+    workout_id = db.Column(db.Integer, nullable=False)
+
+    def __repr__(self):
+        return (
+            f"<PersonalRecord exercise_id={self.exercise_id} kind='{self.kind}' "
+            f"value={self.value} day={self.day}>"
+        )
+
+
+# ── ResourceVersion ───────────────────────────────────────────────────────────
+class ResourceVersion(db.Model):
+    """
+    A write counter per cacheable scope — "workouts", "exercises",
+    "workout:<id>" or "exercise:<id>". Write routes bump every scope they
+    change; read routes derive their ETag from the scopes they depend on.
+    """
+    __tablename__ = "resource_versions"
+
+    scope = db.Column(db.String(64), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, nullable=False)
+
+    def __repr__(self):
+        return f"<ResourceVersion scope='{self.scope}' version={self.version}>"
+
+
+# ── Helpers ───────────────────────────────────────────────────────────────────
+def upsert(table):
+    """
+    An INSERT for `table` supporting `.on_conflict_do_update()` on the
+    current database (SQLite and PostgreSQL share the same construct).
+    """
+    if db.engine.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(table)
@@ -0,0 +1,122 @@
+"""Keyset (cursor) pagination helpers: seek past the last row seen instead of using OFFSET."""
+
+import base64
+import json
+from datetime import date
+from urllib.parse import urlencode
+
+from sqlalchemy import tuple_
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+
+
+# ── Cursor encoding ───────────────────────────────────────────────────────────
+def encode_cursor(values):
+    """Pack a list of JSON-safe sort-key values into an opaque token."""
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token):
+    """Unpack a token produced by `encode_cursor`. Raises ValueError."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor.")
+    if not isinstance(values, list):
+        raise ValueError("Invalid cursor.")
+    return values
+
+
+# ── Keyset ────────────────────────────────────────────────────────────────────
+class Keyset:
+    """
+    A unique sort key made of one or more columns, e.g. (Workout.date, Workout.id).
+    `parsers` turn each cursor value (stored in its JSON form) back into the column's type.
+    """
+
+    def __init__(self, *columns, descending=False, parsers=None):
+        self.columns = columns
+        self.descending = descending
+        self.parsers = parsers or (None,) * len(columns)
+
+    def order_by(self):
+        return [c.desc() if self.descending else c.asc() for c in self.columns]
+
+    def seek(self, values):
+        """SQL condition selecting rows strictly after `values` in sort order."""
+        key = tuple_(*self.columns)
+        bound = tuple_(*values)
+        return key < bound if self.descending else key > bound
+
+    def values(self, row):
+        """The sort-key values of a fetched row, in column order."""
+        return [getattr(row, c.key) for c in self.columns]
+
+    def dump(self, row):
+        values = self.values(row)
+        return encode_cursor([v.isoformat() if isinstance(v, date) else v for v in values])
+
+    def load(self, token):
+        values = decode_cursor(token)
+        if len(values) != len(self.columns):
+            raise ValueError("Invalid cursor.")
+        try:
+            return [p(v) if p else v for p, v in zip(self.parsers, values)]
+        except (ValueError, TypeError):
+            raise ValueError("Invalid cursor.")
+
+    def page(self, query, limit, cursor=None):
+        """
+        Return (rows, next_cursor) for one page of `query`.
+        `next_cursor` is None once the last page has been reached.
+        """
+        if cursor:
+            query = query.filter(self.seek(self.load(cursor)))
+        rows = query.order_by(*self.order_by()).limit(limit + 1).all()
+        if len(rows) <= limit:
+            return rows, None
+        rows = rows[:limit]
+        return rows, self.dump(rows[-1])
+
+
+# ── Request parsing ───────────────────────────────────────────────────────────
+def parse_page_args(args):
+    """
+    Read `limit`, `cursor` and `all` from a query string as (limit, cursor, paginate).
+    Raises ValueError for a malformed limit.
+    """
+    if args.get("all", "").lower() in ("1", "true", "yes"):
+        return None, None, False
+
+    raw_limit = args.get("limit")
+    if raw_limit is None:
+        limit = DEFAULT_LIMIT
+    else:
+        try:
+            limit = int(raw_limit)
+        except ValueError:
+            raise ValueError("'limit' must be an integer.")
+        if not 1 <= limit <= MAX_LIMIT:
+            raise ValueError(f"'limit' must be between 1 and {MAX_LIMIT}.")
+    return limit, args.get("cursor") or None, True
+
+
+def page_headers(next_cursor, path, limit, args=None):
+    """
+    Headers advertising the next page, if there is one. Other query params in
+    `args` (filters, fieldsets) are carried over into the Link.
+    """
+    if not next_cursor:
+        return {}
+    kept = [
+        (key, value) for key, value in (args.items(multi=True) if args else ())
+        if key not in ("limit", "cursor")
+    ]
+    query = urlencode([("limit", limit), *kept, ("cursor", next_cursor)])
+    return {
+        "X-Next-Cursor": next_cursor,
+        "Link": f'<{path}?{query}>; rel="next"',
+    }
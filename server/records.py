@@ -0,0 +1,108 @@
+"""Personal records per exercise (most reps, best volume, longest duration), kept current by the write routes."""
+
+from sqlalchemy import and_, func, literal, or_, union_all
+
+from models import db, Workout, WorkoutExercise, PersonalRecord, upsert
+
+KINDS = ("reps", "volume", "duration_seconds")
+
+
+def _values():
+    we = WorkoutExercise
+    return {
+        "reps": we.reps,
+        "volume": we.sets * we.reps,
+        "duration_seconds": we.duration_seconds,
+    }
+
+
+def _best(where):
+    """SELECT the best (exercise_id, kind, value, day, workout_id) per exercise and kind."""
+    we, w = WorkoutExercise, Workout
+    candidates = union_all(*(
+        db.select(
+            we.exercise_id, literal(kind).label("kind"), value.label("value"),
+            w.date.label("day"), w.id.label("workout_id"),
+        )
+        .join(w, w.id == we.workout_id)
+        .where(where, value.isnot(None))
+        for kind, value in _values().items()
+    )).subquery()
+    position = func.row_number().over(
+        partition_by=(candidates.c.exercise_id, candidates.c.kind),
+        # ties go to the day the value was first reached
+        order_by=(candidates.c.value.desc(), candidates.c.day, candidates.c.workout_id),
+    ).label("position")
+    ranked = db.select(candidates, position).subquery()
+    return (
+        db.select(ranked.c.exercise_id, ranked.c.kind, ranked.c.value, ranked.c.day, ranked.c.workout_id)
+        .where(ranked.c.position == 1)
+    )
+
+
+# ── Maintenance ───────────────────────────────────────────────────────────────
+# Inserts can only raise a record, so they upsert where better. Removals call
+# held_by() before deleting and recompute() those exercises afterwards.
+def add_entries(where):
+    """Fold the workout-exercise entries matching `where` into the records."""
+    table = PersonalRecord.__table__
+    stmt = upsert(table).from_select(["exercise_id", "kind", "value", "day", "workout_id"], _best(where))
+    new = stmt.excluded
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.exercise_id, table.c.kind],
+        set_={"value": new.value, "day": new.day, "workout_id": new.workout_id},
+        where=or_(
+            new.value > table.c.value,
+            and_(new.value == table.c.value, or_(
+                new.day < table.c.day,
+                and_(new.day == table.c.day, new.workout_id < table.c.workout_id),
+            )),
+        ),
+    )
+    db.session.execute(stmt)
+
+
+def held_by(workout_ids, exercise_ids=None):
+    """Exercises with a record set in one of `workout_ids` (a list or a subquery)."""
+    stmt = db.select(PersonalRecord.exercise_id).where(PersonalRecord.workout_id.in_(workout_ids))
+    if exercise_ids is not None:
+        stmt = stmt.where(PersonalRecord.exercise_id.in_(exercise_ids))
+    return sorted(set(db.session.scalars(stmt)))
+
+
+def recompute(exercise_ids):
+    """Rebuild the records of `exercise_ids` from their remaining entries."""
+    if not exercise_ids:
+        return
+    db.session.execute(db.delete(PersonalRecord).where(PersonalRecord.exercise_id.in_(exercise_ids)))
+    add_entries(WorkoutExercise.exercise_id.in_(exercise_ids))
+
+
+def drop_exercise(exercise_id):
+    """Forget the records of an exercise that is being deleted."""
+    db.session.execute(db.delete(PersonalRecord).where(PersonalRecord.exercise_id == exercise_id))
+
+
+def rebuild():
+    """Recompute every record from scratch (after bulk loads)."""
+    db.session.execute(db.delete(PersonalRecord))
+    add_entries(db.true())
+    db.session.commit()
+
+
+# ── Queries ───────────────────────────────────────────────────────────────────
+def for_exercise(exercise):
+    """The exercise's records, {kind: {value, date, workout_id} or None}."""
+    rows = db.session.execute(
+        db.select(PersonalRecord.kind, PersonalRecord.value, PersonalRecord.day, PersonalRecord.workout_id)
+        .where(PersonalRecord.exercise_id == exercise.id)
+    )
+    found = {
+        row.kind: {"value": row.value, "date": row.day.isoformat(), "workout_id": row.workout_id}
+        for row in rows
+    }
+    return {
+        "exercise_id": exercise.id,
+        "name": exercise.name,
+        "records": {kind: found.get(kind) for kind in KINDS},
+    }
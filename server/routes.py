@@ -0,0 +1,828 @@
+"""
+The HTTP API, registered on the app by `create_app()` (see app.py).
+"""
+
+from datetime import date
+from functools import partial
+
+from flask import Blueprint, Response, current_app, make_response, request, jsonify, stream_with_context
+from marshmallow import ValidationError
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import load_only, selectinload
+
+from models import db, Workout, Exercise, WorkoutExercise, upsert
+from listings import (
+    WORKOUT_COLUMNS, EXERCISE_COLUMNS, WORKOUT_SORT, EXERCISE_SORT, STREAM_FORMATS,
+    columns, dump_workouts, dump_exercises, workout_dicts, exercise_dicts, stream,
+)
+from fieldsets import WORKOUT_FIELDS, EXERCISE_FIELDS
+from filters import workout_filters
+from pagination import Keyset, parse_page_args, page_headers
+import analytics
+import cache
+from cache import cached
+import metrics
+import records
+import search
+import trainingload
+import transfer
+from metrics import measure
+from versions import DELETIONS, bump, conditional
+from schemas import workout_schema, exercise_schema, workout_exercise_schema, workout_exercises_schema
+
+api = Blueprint("api", __name__)
+
+
+# ── Eager-loading options ─────────────────────────────────────────────────────
+# The schemas walk these relationships on dump; loading them up front keeps a
+# listing at a fixed number of queries instead of one (or two) per row.
+# Only the columns and relationships the request's fieldset asks for are loaded.
+def workout_graph(fieldset):
+    options = [load_only(*(getattr(Workout, f) for f in fieldset.fields))]
+    if "workout_exercises" in fieldset.includes:
+        loader = selectinload(Workout.workout_exercises)
+        if "exercise" in fieldset.includes:
+            loader = loader.selectinload(WorkoutExercise.exercise)
+        options.append(loader)
+    return options
+
+
+def exercise_graph(fieldset):
+    options = [load_only(*(getattr(Exercise, f) for f in fieldset.fields))]
+    if "workouts" in fieldset.includes:
+        options.append(selectinload(Exercise.workouts))
+    return options
+
+# ── Listing sort keys ─────────────────────────────────────────────────────────
+# Each ends in the primary key so the order is total and cursors are stable.
+WORKOUT_KEYSET = Keyset(
+    Workout.date, Workout.id, descending=True, parsers=(date.fromisoformat, int)
+)
+EXERCISE_KEYSET = Keyset(Exercise.name, Exercise.id, parsers=(str, int))
+
+
+def paginated(query, keyset):
+    """
+    Apply the request's `limit`/`cursor` (or `?all=true`) to a listing query.
+    Returns (rows, headers). Raises ValueError for a bad limit or cursor.
+    """
+    limit, cursor, paginate = parse_page_args(request.args)
+    if not paginate:
+        return query.order_by(*keyset.order_by()).all(), {}
+    rows, next_cursor = keyset.page(query, limit, cursor)
+    return rows, page_headers(next_cursor, request.path, limit, request.args)
+
+
+def streamed(query, keyset, to_dicts):
+    """
+    A streaming response for `?stream=json|ndjson`, or None if not requested.
+    Raises ValueError for an unknown format.
+    """
+    fmt = request.args.get("stream")
+    if not fmt:
+        return None
+    if fmt not in STREAM_FORMATS:
+        raise ValueError(f"'stream' must be one of: {', '.join(STREAM_FORMATS)}.")
+    return Response(
+        stream_with_context(stream(query, keyset, to_dicts, fmt)),
+        200, mimetype=STREAM_FORMATS[fmt],
+    )
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+#  WORKOUT ROUTES
+# ─────────────────────────────────────────────────────────────────────────────
+
+# ── GET /workouts ─────────────────────────────────────────────────────────────
+@api.route('/workouts', methods=['GET'])
+@conditional("workouts")
+@cached("workouts")
+def get_workouts():
+    """
+    List workouts, newest first, one page at a time.
+    Query params: `limit`, `cursor` (from X-Next-Cursor), or `all=true`;
+    `fields` / `include` to trim the response; filters `from`, `to`,
+    `min_duration`, `max_duration`, `exercise_id`, `category`, `equipment_needed`.
+    `stream=json|ndjson` streams the full history instead.
+    """
+    try:
+        fieldset = WORKOUT_FIELDS.parse(request.args)
+        query = (
+            db.session.query(*columns(WORKOUT_COLUMNS, fieldset, WORKOUT_SORT))
+            .filter(*workout_filters(request.args))
+        )
+        response = streamed(query, WORKOUT_KEYSET, partial(workout_dicts, fieldset=fieldset))
+        if response:
+            return response
+        rows, headers = paginated(query, WORKOUT_KEYSET)
+    except ValueError as err:
+        return make_response(jsonify({"error": str(err)}), 400)
+    return make_response(
+        dump_workouts(rows, fieldset), 200,
+        {'Content-Type': 'application/json', **headers}
+    )
+
+
+# ── GET /workouts/<id> ────────────────────────────────────────────────────────
+@api.route('/workouts/<int:id>', methods=['GET'])
+@conditional("workout:{id}", DELETIONS)
+def get_workout(id):
+    """
+    Show a single workout with its associated exercises.
+    Includes reps/sets/duration data from WorkoutExercises.
+    Query params: `fields` / `include` to trim the response.
+    """
+    try:
+        fieldset = WORKOUT_FIELDS.parse(request.args)
+    except ValueError as err:
+        return make_response(jsonify({"error": str(err)}), 400)
+    workout = Workout.query.options(*workout_graph(fieldset)).get(id)
+    if not workout:
+        return make_response(
+            jsonify({"error": f"Workout with id {id} not found."}), 404
+        )
+    schema = WORKOUT_FIELDS.schema(fieldset)
+    return make_response(measure("ser", schema.dumps, workout), 200, {'Content-Type': 'application/json'})
+
+
+# ── POST /workouts ────────────────────────────────────────────────────────────
+@api.route('/workouts', methods=['POST'])
+def create_workout():
+    """Create a new workout."""
+    json_data = request.get_json()
+    if not json_data:
+        return make_response(jsonify({"error": "No input data provided."}), 400)
+
+    try:
+        data = measure("ser", workout_schema.load, json_data)
+    except ValidationError as err:
+        return make_response(jsonify({"errors": err.messages}), 422)
+
+    try:
+        workout = Workout(**data)
+        db.session.add(workout)
+        db.session.flush()
+        analytics.add_workouts(Workout.id == workout.id)
+        bump("workouts", f"workout:{workout.id}", *trainingload.scopes([workout.date]))
+        db.session.commit()
+    except ValueError as err:
+        db.session.rollback()
+        return make_response(jsonify({"error": str(err)}), 422)
+
+    return make_response(measure("ser", workout_schema.dumps, workout), 201, {'Content-Type': 'application/json'})
+
+
+# ── POST /workouts/batch ──────────────────────────────────────────────────────
+BATCH_LIMIT = 1000
+SETS_OR_DURATION_ERROR = "Please provide either 'sets' (with optional 'reps') or 'duration_seconds'."
+
+
+def load_workout_exercise_entry(entry):
+    """
+    Validate one nested {exercise_id, sets, reps, duration_seconds} entry.
+    Returns the loaded data (including exercise_id) or raises ValidationError.
+    """
+    if not isinstance(entry, dict):
+        raise ValidationError("Each exercise entry must be an object.")
+    entry = dict(entry)
+    exercise_id = entry.pop("exercise_id", None)
+    errors = {}
+    if not isinstance(exercise_id, int) or isinstance(exercise_id, bool):
+        errors["exercise_id"] = ["A valid integer is required."]
+    try:
+        data = workout_exercise_schema.load(entry)
+    except ValidationError as err:
+        errors.update(err.messages)
+        data = {}
+    if not errors and not data.get("sets") and not data.get("duration_seconds"):
+        errors["_schema"] = [SETS_OR_DURATION_ERROR]
+    if errors:
+        raise ValidationError(errors)
+    data["exercise_id"] = exercise_id
+    return data
+
+
+@api.route('/workouts/batch', methods=['POST'])
+def create_workouts_batch():
+    """
+    Create many workouts, each with its nested exercise entries, in one transaction.
+    Body: a list of workouts (or {"workouts": [...]}); each may carry a
+    `workout_exercises` list of {exercise_id, sets, reps, duration_seconds}.
+    Invalid items are reported by index and skipped; the rest are inserted.
+    """
+    json_data = request.get_json()
+    if isinstance(json_data, dict):
+        json_data = json_data.get("workouts")
+    if not json_data or not isinstance(json_data, list):
+        return make_response(jsonify({"error": "No input data provided."}), 400)
+    if len(json_data) > BATCH_LIMIT:
+        return make_response(
+            jsonify({"error": f"A batch cannot contain more than {BATCH_LIMIT} workouts."}), 400
+        )
+
+    # ── Validate every item before touching the database ─────────────────────
+    errors, valid = [], []
+    for index, item in enumerate(json_data):
+        if not isinstance(item, dict):
+            errors.append({"index": index, "errors": {"_schema": ["Each workout must be an object."]}})
+            continue
+        item = dict(item)
+        entries = item.pop("workout_exercises", None) or []
+        item_errors = {}
+        try:
+            data = workout_schema.load(item)
+        except ValidationError as err:
+            item_errors.update(err.messages)
+        entry_errors, loaded, seen = {}, [], set()
+        for pos, entry in enumerate(entries if isinstance(entries, list) else [None]):
+            try:
+                entry_data = load_workout_exercise_entry(entry)
+            except ValidationError as err:
+                entry_errors[pos] = err.messages
+                continue
+            if entry_data["exercise_id"] in seen:
+                entry_errors[pos] = {"exercise_id": ["Exercise appears more than once in this workout."]}
+                continue
+            seen.add(entry_data["exercise_id"])
+            loaded.append(entry_data)
+        if entry_errors:
+            item_errors["workout_exercises"] = entry_errors
+        if item_errors:
+            errors.append({"index": index, "errors": item_errors})
+        else:
+            valid.append((index, data, loaded))
+
+    # One lookup for every referenced exercise instead of one per entry
+    wanted = {e["exercise_id"] for _, _, loaded in valid for e in loaded}
+    known = set()
+    if wanted:
+        known = {
+            row.id for row in
+            db.session.query(Exercise.id).filter(Exercise.id.in_(wanted))
+        }
+
+    workouts = []
+    for index, data, loaded in valid:
+        missing = sorted(e["exercise_id"] for e in loaded if e["exercise_id"] not in known)
+        if missing:
+            errors.append({"index": index, "errors": {
+                "workout_exercises": [f"Exercise with id {m} not found." for m in missing]
+            }})
+            continue
+        try:
+            workouts.append((index, Workout(**data), loaded))
+        except ValueError as err:
+            errors.append({"index": index, "errors": {"_schema": [str(err)]}})
+
+    # ── Insert everything in a single transaction ────────────────────────────
+    if workouts:
+        db.session.add_all([workout for _, workout, _ in workouts])
+        db.session.flush()
+        rows = [
+            {
+                "workout_id": workout.id,
+                "exercise_id": entry["exercise_id"],
+                "reps": entry.get("reps"),
+                "sets": entry.get("sets"),
+                "duration_seconds": entry.get("duration_seconds"),
+            }
+            for _, workout, loaded in workouts
+            for entry in loaded
+        ]
+        if rows:
+            db.session.execute(WorkoutExercise.__table__.insert(), rows)
+        new_ids = [workout.id for _, workout, _ in workouts]
+        analytics.add_workouts(Workout.id.in_(new_ids))
+        analytics.add_entries(WorkoutExercise.workout_id.in_(new_ids))
+        records.add_entries(WorkoutExercise.workout_id.in_(new_ids))
+        bump(
+            "workouts", "exercises",
+            *(f"workout:{workout.id}" for _, workout, _ in workouts),
+            *(f"exercise:{row['exercise_id']}" for row in rows),
+            *trainingload.scopes(workout.date for _, workout, _ in workouts),
+        )
+        db.session.commit()
+
+    errors.sort(key=lambda e: e["index"])
+    created = [{"index": index, "id": workout.id} for index, workout, _ in workouts]
+    return make_response(
+        jsonify({"created": created, "errors": errors}),
+        201 if created else 422
+    )
+
+
+# ── DELETE /workouts/<id> ─────────────────────────────────────────────────────
+@api.route('/workouts/<int:id>', methods=['DELETE'])
+def delete_workout(id):
+    """
+    Delete a workout.
+    Associated WorkoutExercises are deleted by the database (ON DELETE CASCADE).
+    """
+    workout = Workout.query.get(id)
+    if not workout:
+        return make_response(
+            jsonify({"error": f"Workout with id {id} not found."}), 404
+        )
+
+    exercise_ids = db.session.scalars(
+        db.select(WorkoutExercise.exercise_id).where(WorkoutExercise.workout_id == id)
+    ).all()
+    held = records.held_by([id])
+    analytics.add_entries(WorkoutExercise.workout_id == id, sign=-1)
+    analytics.add_workouts(Workout.id == id, sign=-1)
+    bump(
+        "workouts", "exercises", f"workout:{id}",
+        *(f"exercise:{e}" for e in exercise_ids), *trainingload.scopes([workout.date]),
+    )
+    db.session.delete(workout)
+    db.session.flush()
+    records.recompute(held)
+    db.session.commit()
+    return make_response(
+        jsonify({"message": f"Workout (id={id}) deleted successfully."}), 200
+    )
+
+
+# ── DELETE /workouts?from=&to= ────────────────────────────────────────────────
+@api.route('/workouts', methods=['DELETE'])
+def delete_workouts():
+    """
+    Delete every workout dated within `from`..`to` (inclusive; both required).
+    Runs as one set-based DELETE; entries go with it via ON DELETE CASCADE.
+    """
+    bounds = {}
+    for key in ("from", "to"):
+        try:
+            bounds[key] = date.fromisoformat(request.args.get(key, ""))
+        except ValueError:
+            return make_response(
+                jsonify({"error": f"'{key}' is required and must be a date (YYYY-MM-DD)."}), 400
+            )
+    if bounds["from"] > bounds["to"]:
+        return make_response(jsonify({"error": "'from' must not be after 'to'."}), 400)
+
+    in_range = Workout.date.between(bounds["from"], bounds["to"])
+    workout_ids = db.select(Workout.id).where(in_range).scalar_subquery()
+    entries = WorkoutExercise.workout_id.in_(workout_ids)
+    months = trainingload.scopes_of(in_range)
+    held = records.held_by(workout_ids)
+    analytics.add_entries(entries, sign=-1)
+    analytics.add_workouts(in_range, sign=-1)
+    bump("workouts", "exercises", DELETIONS, *months)
+    deleted = db.session.execute(
+        db.delete(Workout).where(in_range).execution_options(synchronize_session=False)
+    ).rowcount
+    records.recompute(held)
+    db.session.commit()
+    return make_response(jsonify({"deleted": deleted}), 200)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+#  EXERCISE ROUTES
+# ─────────────────────────────────────────────────────────────────────────────
+
+# ── GET /exercises ────────────────────────────────────────────────────────────
+@api.route('/exercises', methods=['GET'])
+@conditional("exercises")
+@cached("catalog")
+def get_exercises():
+    """
+    List exercises by name, one page at a time.
+    Query params: `limit`, `cursor` (from X-Next-Cursor), or `all=true`;
+    `fields` / `include` to trim the response.
+    `stream=json|ndjson` streams the full catalog instead.
+    """
+    try:
+        fieldset = EXERCISE_FIELDS.parse(request.args)
+        query = db.session.query(*columns(EXERCISE_COLUMNS, fieldset, EXERCISE_SORT))
+        response = streamed(query, EXERCISE_KEYSET, partial(exercise_dicts, fieldset=fieldset))
+        if response:
+            return response
+        rows, headers = paginated(query, EXERCISE_KEYSET)
+    except ValueError as err:
+        return make_response(jsonify({"error": str(err)}), 400)
+    return make_response(
+        dump_exercises(rows, fieldset), 200,
+        {'Content-Type': 'application/json', **headers}
+    )
+
+
+# ── GET /exercises/<id> ───────────────────────────────────────────────────────
+@api.route('/exercises/<int:id>', methods=['GET'])
+@conditional("exercise:{id}", DELETIONS)
+@cached("exercises")
+def get_exercise(id):
+    """
+    Show an exercise and its associated workouts.
+    Query params: `fields` / `include` to trim the response.
+    """
+    try:
+        fieldset = EXERCISE_FIELDS.parse(request.args)
+    except ValueError as err:
+        return make_response(jsonify({"error": str(err)}), 400)
+    exercise = Exercise.query.options(*exercise_graph(fieldset)).get(id)
+    if not exercise:
+        return make_response(
+            jsonify({"error": f"Exercise with id {id} not found."}), 404
+        )
+    schema = EXERCISE_FIELDS.schema(fieldset)
+    return make_response(measure("ser", schema.dumps, exercise), 200, {'Content-Type': 'application/json'})
+
+
+# ── GET /exercises/<id>/records ───────────────────────────────────────────────
+@api.route('/exercises/<int:id>/records', methods=['GET'])
+@conditional("exercise:{id}", DELETIONS)
+def get_exercise_records(id):
+    """Personal records for an exercise: most reps, biggest volume, longest duration."""
+    exercise = db.session.get(Exercise, id)
+    if not exercise:
+        return make_response(
+            jsonify({"error": f"Exercise with id {id} not found."}), 404
+        )
+    return make_response(jsonify(records.for_exercise(exercise)), 200)
+
+
+# ── POST /exercises ───────────────────────────────────────────────────────────
+@api.route('/exercises', methods=['POST'])
+def create_exercise():
+    """Create a new exercise."""
+    json_data = request.get_json()
+    if not json_data:
+        return make_response(jsonify({"error": "No input data provided."}), 400)
+
+    try:
+        data = measure("ser", exercise_schema.load, json_data)
+    except ValidationError as err:
+        return make_response(jsonify({"errors": err.messages}), 422)
+
+    try:
+        exercise = Exercise(**data)
+        db.session.add(exercise)
+        db.session.flush()
+        bump("exercises", f"exercise:{exercise.id}")
+        db.session.commit()
+    except ValueError as err:
+        db.session.rollback()
+        return make_response(jsonify({"error": str(err)}), 422)
+    except IntegrityError:
+        db.session.rollback()
+        return make_response(
+            jsonify({"error": f"An exercise named '{data.get('name')}' already exists."}), 409
+        )
+
+    return make_response(measure("ser", exercise_schema.dumps, exercise), 201, {'Content-Type': 'application/json'})
+
+
+# ── DELETE /exercises/<id> ────────────────────────────────────────────────────
+@api.route('/exercises/<int:id>', methods=['DELETE'])
+def delete_exercise(id):
+    """
+    Delete an exercise.
+    Associated WorkoutExercises are deleted by the database (ON DELETE CASCADE).
+    """
+    exercise = Exercise.query.get(id)
+    if not exercise:
+        return make_response(
+            jsonify({"error": f"Exercise with id {id} not found."}), 404
+        )
+
+    months = trainingload.scopes_of(Workout.id.in_(
+        db.select(WorkoutExercise.workout_id).where(WorkoutExercise.exercise_id == id)
+    ))
+    analytics.drop_exercise(id)
+    records.drop_exercise(id)
+    bump("workouts", "exercises", f"exercise:{id}", DELETIONS, *months)
+    db.session.delete(exercise)
+    db.session.commit()
+    return make_response(
+        jsonify({"message": f"Exercise '{exercise.name}' deleted successfully."}), 200
+    )
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+#  ANALYTICS ROUTES
+# ─────────────────────────────────────────────────────────────────────────────
+
+# ── GET /analytics/exercises ──────────────────────────────────────────────────
+@api.route('/analytics/exercises', methods=['GET'])
+@conditional("workouts")
+def get_exercise_analytics():
+    """
+    Per-exercise training totals: sessions, sets, reps, sets × reps volume and
+    time under tension. Query params: `from`, `to`, `exercise_id`, `source=live`.
+    """
+    try:
+        filters = analytics.parse_filters(request.args)
+    except ValueError as err:
+        return make_response(jsonify({"error": str(err)}), 400)
+    return make_response(jsonify(analytics.exercise_totals(filters)), 200)
+
+
+# ── GET /analytics/volume ─────────────────────────────────────────────────────
+@api.route('/analytics/volume', methods=['GET'])
+@conditional("workouts")
+def get_volume_analytics():
+    """
+    Training totals per period, plus workout counts and minutes.
+    Query params: `period` (day/week/month/year), `from`, `to`, `exercise_id`, `source=live`.
+    """
+    try:
+        filters = analytics.parse_filters(request.args)
+    except ValueError as err:
+        return make_response(jsonify({"error": str(err)}), 400)
+    return make_response(jsonify(analytics.period_totals(filters)), 200)
+
+
+# ── GET /analytics/load ───────────────────────────────────────────────────────
+@api.route('/analytics/load', methods=['GET'])
+@conditional(trainingload.request_scopes)
+@cached("load")
+def get_training_load():
+    """
+    Daily and weekly training load with 7/28-day acute:chronic workload ratios and heatmap levels.
+    Query params: `from`, `to` (required), `measure` (duration_minutes/volume).
+    """
+    try:
+        filters = trainingload.parse_filters(request.args)
+    except ValueError as err:
+        return make_response(jsonify({"error": str(err)}), 400)
+    return make_response(jsonify(trainingload.series(filters)), 200)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+#  SEARCH ROUTE
+# ─────────────────────────────────────────────────────────────────────────────
+
+# ── GET /search ───────────────────────────────────────────────────────────────
+@api.route('/search', methods=['GET'])
+@conditional("workouts", "exercises")
+def get_search():
+    """
+    Full-text search (see search.py): best match first, or newest first for
+    very broad searches, as reported in X-Search-Order.
+    Query params: `q`; `type=workouts` (notes, the default) or `type=exercises`
+    (names); `limit`, `cursor` or `all=true`; `fields` / `include`. Workout
+    searches also take the GET /workouts filters.
+    """
+    kind = request.args.get("type", "workouts")
+    if kind not in search.SEARCHES:
+        return make_response(
+            jsonify({"error": f"'type' must be one of: {', '.join(search.SEARCHES)}."}), 400
+        )
+    try:
+        if kind == "workouts":
+            fieldset = WORKOUT_FIELDS.parse(request.args)
+            query, keyset, order = search.search_query(
+                kind, request.args.get("q"), columns(WORKOUT_COLUMNS, fieldset, WORKOUT_SORT),
+                request.args.get("cursor"),
+            )
+            query = query.filter(*workout_filters(request.args))
+        else:
+            fieldset = EXERCISE_FIELDS.parse(request.args)
+            query, keyset, order = search.search_query(
+                kind, request.args.get("q"), columns(EXERCISE_COLUMNS, fieldset, EXERCISE_SORT),
+                request.args.get("cursor"),
+            )
+        rows, headers = paginated(query, keyset)
+    except ValueError as err:
+        return make_response(jsonify({"error": str(err)}), 400)
+    body = dump_workouts(rows, fieldset) if kind == "workouts" else dump_exercises(rows, fieldset)
+    return make_response(
+        body, 200, {'Content-Type': 'application/json', 'X-Search-Order': order, **headers}
+    )
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+#  EXPORT ROUTE
+# ─────────────────────────────────────────────────────────────────────────────
+
+# ── GET /export ───────────────────────────────────────────────────────────────
+@api.route('/export', methods=['GET'])
+@conditional("workouts", "exercises")
+def get_export():
+    """
+    The whole training log as NDJSON (see transfer.py), streamed from the
+    database. `gzip=true` compresses the stream on the fly.
+    """
+    compress = request.args.get("gzip", "").lower() in ("true", "1")
+    body = transfer.export_lines()
+    if compress:
+        return Response(
+            stream_with_context(transfer.gzipped(body)), 200, mimetype="application/gzip",
+            headers={"Content-Disposition": "attachment; filename=workout-log.ndjson.gz"},
+        )
+    return Response(
+        stream_with_context(body), 200, mimetype=STREAM_FORMATS["ndjson"],
+        headers={"Content-Disposition": "attachment; filename=workout-log.ndjson"},
+    )
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+#  CACHE & METRICS ROUTES
+# ─────────────────────────────────────────────────────────────────────────────
+
+# ── GET /cache/stats ──────────────────────────────────────────────────────────
+@api.route('/cache/stats', methods=['GET'])
+def get_cache_stats():
+    """Hit/miss counters and occupancy for each in-process response cache."""
+    return make_response(jsonify({c.name: c.stats() for c in cache.caches()}), 200)
+
+
+# ── GET /metrics ──────────────────────────────────────────────────────────────
+@api.route('/metrics', methods=['GET'])
+def get_metrics():
+    """
+    Per-route latency, query-count and phase histograms plus cache counters,
+    in Prometheus text format. Only answered on the loopback interface unless
+    METRICS_PUBLIC is set.
+    """
+    if not current_app.config['METRICS_PUBLIC'] and request.remote_addr not in ('127.0.0.1', '::1'):
+        return make_response(jsonify({"error": "Not found."}), 404)
+    return make_response(
+        metrics.registry().render(metrics.cache_lines(cache.caches())), 200,
+        {'Content-Type': 'text/plain; version=0.0.4'}
+    )
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+#  WORKOUT EXERCISE ROUTES
+# ─────────────────────────────────────────────────────────────────────────────
+
+# ── POST /workouts/<workout_id>/exercises/<exercise_id>/workout_exercises ──────
+@api.route(
+    '/workouts/<int:workout_id>/exercises/<int:exercise_id>/workout_exercises',
+    methods=['POST']
+)
+def add_exercise_to_workout(workout_id, exercise_id):
+    """
+    Add an exercise to a workout, including reps/sets/duration.
+    Requires at least one of: sets, duration_seconds.
+    """
+    workout = Workout.query.get(workout_id)
+    if not workout:
+        return make_response(
+            jsonify({"error": f"Workout with id {workout_id} not found."}), 404
+        )
+
+    exercise = Exercise.query.get(exercise_id)
+    if not exercise:
+        return make_response(
+            jsonify({"error": f"Exercise with id {exercise_id} not found."}), 404
+        )
+
+    json_data = request.get_json() or {}
+
+    try:
+        data = measure("ser", workout_exercise_schema.load, json_data)
+    except ValidationError as err:
+        return make_response(jsonify({"errors": err.messages}), 422)
+
+    # Business rule: must provide sets or duration_seconds
+    if not data.get("sets") and not data.get("duration_seconds"):
+        return make_response(
+            jsonify({"error": SETS_OR_DURATION_ERROR}),
+            422
+        )
+
+    try:
+        workout_exercise = WorkoutExercise(
+            workout_id=workout_id,
+            exercise_id=exercise_id,
+            reps=data.get("reps"),
+            sets=data.get("sets"),
+            duration_seconds=data.get("duration_seconds"),
+        )
+        db.session.add(workout_exercise)
+        db.session.flush()
+        analytics.add_entries(WorkoutExercise.id == workout_exercise.id)
+        records.add_entries(WorkoutExercise.id == workout_exercise.id)
+        bump(
+            "workouts", "exercises", f"workout:{workout_id}", f"exercise:{exercise_id}",
+            *trainingload.scopes([workout.date]),
+        )
+        db.session.commit()
+    except ValueError as err:
+        db.session.rollback()
+        return make_response(jsonify({"error": str(err)}), 422)
+    except IntegrityError:
+        db.session.rollback()
+        return make_response(
+            jsonify({
+                "error": (
+                    f"Exercise (id={exercise_id}) is already in "
+                    f"Workout (id={workout_id})."
+                )
+            }),
+            409
+        )
+
+    return make_response(
+        measure("ser", workout_exercise_schema.dumps, workout_exercise), 201,
+        {'Content-Type': 'application/json'}
+    )
+
+
+# ── PUT /workouts/<id>/exercises ──────────────────────────────────────────────
+ENTRY_FIELDS = ("reps", "sets", "duration_seconds")
+
+
+@api.route('/workouts/<int:id>/exercises', methods=['PUT'])
+def set_workout_exercises(id):
+    """
+    Replace a workout's whole exercise list in one request, writing only what changed.
+    Body: a list (or {"workout_exercises": [...]}) of {exercise_id, sets, reps, duration_seconds}.
+    All-or-nothing: any invalid entry fails the whole request with 422.
+    """
+    workout = Workout.query.get(id)
+    if not workout:
+        return make_response(
+            jsonify({"error": f"Workout with id {id} not found."}), 404
+        )
+
+    json_data = request.get_json()
+    if isinstance(json_data, dict):
+        json_data = json_data.get("workout_exercises")
+    if not isinstance(json_data, list):
+        return make_response(jsonify({"error": "No input data provided."}), 400)
+
+    # ── Validate the whole list before touching the database ─────────────────
+    errors, wanted, indexes = [], {}, {}
+    for index, entry in enumerate(json_data):
+        try:
+            data = load_workout_exercise_entry(entry)
+        except ValidationError as err:
+            errors.append({"index": index, "errors": err.messages})
+            continue
+        if data["exercise_id"] in wanted:
+            errors.append({"index": index, "errors": {
+                "exercise_id": ["Exercise appears more than once in this workout."]
+            }})
+            continue
+        wanted[data["exercise_id"]] = {f: data.get(f) for f in ENTRY_FIELDS}
+        indexes[data["exercise_id"]] = index
+
+    known = set()
+    if wanted:
+        known = {
+            row.id for row in
+            db.session.query(Exercise.id).filter(Exercise.id.in_(wanted))
+        }
+    for exercise_id, index in indexes.items():
+        if exercise_id not in known:
+            errors.append({"index": index, "errors": {
+                "exercise_id": [f"Exercise with id {exercise_id} not found."]
+            }})
+    if errors:
+        errors.sort(key=lambda e: e["index"])
+        return make_response(jsonify({"errors": errors}), 422)
+
+    # ── Diff against what is stored ──────────────────────────────────────────
+    we = WorkoutExercise
+    stored = {
+        row.exercise_id: {f: getattr(row, f) for f in ENTRY_FIELDS}
+        for row in db.session.execute(
+            db.select(we.exercise_id, *(getattr(we, f) for f in ENTRY_FIELDS))
+            .where(we.workout_id == id)
+        )
+    }
+    removed = stored.keys() - wanted.keys()
+    written = {e: values for e, values in wanted.items() if stored.get(e) != values}
+    changed = removed | written.keys()
+
+    if changed:
+        touched = (we.workout_id == id) & we.exercise_id.in_(changed)
+        held = records.held_by([id], changed)
+        analytics.add_entries(touched, sign=-1)
+        if removed:
+            db.session.execute(
+                db.delete(we).where(we.workout_id == id, we.exercise_id.in_(removed))
+            )
+        if written:
+            table = we.__table__
+            stmt = upsert(table).values([
+                {"workout_id": id, "exercise_id": e, **values} for e, values in written.items()
+            ])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[table.c.workout_id, table.c.exercise_id],
+                set_={f: stmt.excluded[f] for f in ENTRY_FIELDS},
+            )
+            db.session.execute(stmt)
+        analytics.add_entries(touched)
+        records.recompute(held)
+        records.add_entries(touched)
+        bump(
+            "workouts", "exercises", f"workout:{id}",
+            *(f"exercise:{e}" for e in changed), *trainingload.scopes([workout.date]),
+        )
+        db.session.commit()
+
+    entries = (
+        we.query.options(selectinload(we.exercise))
+        .filter(we.workout_id == id)
+        .order_by(we.id)
+        .all()
+    )
+    return make_response(
+        measure("ser", workout_exercises_schema.dumps, entries), 200,
+        {'Content-Type': 'application/json'}
+    )
@@ -0,0 +1,147 @@
+"""Full-text search over exercise names and workout notes: FTS5 on SQLite, LIKE elsewhere."""
+
+import re
+
+from sqlalchemy import Column, Float, Integer, MetaData, Table, Text, event, func, text
+
+from models import db, Exercise, Workout
+from pagination import Keyset, decode_cursor
+
+# Searchable resource -> (model, indexed column)
+SEARCHES = {
+    "workouts": (Workout, "notes"),
+    "exercises": (Exercise, "name"),
+}
+MAX_TERMS = 16
+# bm25 scores every match before the first row comes back; past this many
+# matches results come newest first instead, straight off the index.
+RANKED_MATCHES = 10_000
+
+# The virtual tables, described for query building only; they are created by
+# `install()`, never by metadata.create_all().
+fts_metadata = MetaData()
+FTS_TABLES = {
+    kind: Table(
+        f"{model.__tablename__}_fts", fts_metadata,
+        Column("rowid", Integer), Column(column, Text), Column("rank", Float),
+    )
+    for kind, (model, column) in SEARCHES.items()
+}
+
+
+# ── Schema ────────────────────────────────────────────────────────────────────
+def ddl(source, column):
+    """CREATE statements for the FTS5 index of `source.column` and its triggers."""
+    fts = f"{source}_fts"
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"{column}, content='{source}', content_rowid='id', "
+        f"tokenize='porter unicode61', prefix='2 3')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {source} BEGIN "
+        f"INSERT INTO {fts}(rowid, {column}) VALUES (new.id, new.{column}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {source} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {column}) VALUES ('delete', old.id, old.{column}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {column} ON {source} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {column}) VALUES ('delete', old.id, old.{column}); "
+        f"INSERT INTO {fts}(rowid, {column}) VALUES (new.id, new.{column}); END",
+    ]
+
+
+# Batch-mode migrations that recreate `workouts` or `exercises` drop the
+# triggers; such a migration must call install() again afterwards.
+def install(connection, rebuild=True):
+    """Create the FTS5 tables and triggers (SQLite only) and index existing rows."""
+    if connection.dialect.name != "sqlite":
+        return
+    for model, column in SEARCHES.values():
+        for statement in ddl(model.__tablename__, column):
+            connection.execute(text(statement))
+        if rebuild:
+            fts = f"{model.__tablename__}_fts"
+            connection.execute(text(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"))
+
+
+def include_name(name, type_, parent_names):
+    """Alembic autogenerate filter: leave the FTS tables and their shadow tables alone."""
+    if type_ != "table":
+        return True
+    return not any(name == t.name or name.startswith(f"{t.name}_") for t in FTS_TABLES.values())
+
+
+@event.listens_for(db.metadata, "after_create")
+def _create_fts(target, connection, **kw):
+    install(connection, rebuild=False)
+
+
+@event.listens_for(db.metadata, "before_drop")
+def _drop_fts(target, connection, **kw):
+    if connection.dialect.name == "sqlite":
+        for table in FTS_TABLES.values():
+            connection.execute(text(f"DROP TABLE IF EXISTS {table.name}"))
+
+
+# ── Queries ───────────────────────────────────────────────────────────────────
+def terms(query_text):
+    """The words of a search string. Raises ValueError with a client-facing message."""
+    words = re.findall(r"\w+", query_text or "")
+    if not words:
+        raise ValueError("'q' must contain at least one word.")
+    if len(words) > MAX_TERMS:
+        raise ValueError(f"'q' cannot contain more than {MAX_TERMS} words.")
+    return words
+
+
+def match_expression(words):
+    """An FTS5 query: every word must appear, the last one as a prefix."""
+    return " ".join(f'"{word}"' for word in words) + "*"
+
+
+def _matches(kind, words):
+    fts = FTS_TABLES[kind]
+    return fts.c[SEARCHES[kind][1]].match(match_expression(words))
+
+
+def is_selective(kind, words):
+    """Whether at most RANKED_MATCHES rows match — counted from the index alone."""
+    fts = FTS_TABLES[kind]
+    first = db.select(fts.c.rowid).where(_matches(kind, words)).limit(RANKED_MATCHES + 1)
+    return db.session.scalar(db.select(func.count()).select_from(first.subquery())) <= RANKED_MATCHES
+
+
+def fts_query(kind, words, selected, order="rank"):
+    """(query, keyset): rows of `kind` matching every word, best bm25 `rank` or most `recent` first."""
+    model, _ = SEARCHES[kind]
+    fts = FTS_TABLES[kind]
+    sort = fts.c.rank if order == "rank" else fts.c.rowid
+    query = (
+        db.session.query(*selected, sort)
+        .select_from(fts)
+        .join(model, model.id == fts.c.rowid)
+        .filter(_matches(kind, words))
+    )
+    if order == "rank":
+        return query, Keyset(fts.c.rank, model.id, parsers=(float, int))
+    return query, Keyset(fts.c.rowid, descending=True, parsers=(int,))
+
+
+def like_query(kind, words, selected):
+    """(query, keyset): rows of `kind` containing every word, newest id first. Scans the table."""
+    model, column = SEARCHES[kind]
+    escaped = (w.replace("_", "\\_") for w in words)  # \w+ words can hold "_", never "%"
+    query = db.session.query(*selected).filter(
+        *(getattr(model, column).ilike(f"%{word}%", escape="\\") for word in escaped)
+    )
+    return query, Keyset(model.id, descending=True, parsers=(int,))
+
+
+def search_query(kind, query_text, selected, cursor=None):
+    """(query, keyset, order) for a search of `kind`. Raises ValueError for a bad search string or cursor."""
+    words = terms(query_text)
+    if db.engine.dialect.name != "sqlite":
+        return (*like_query(kind, words, selected), "recent")
+    if cursor:
+        ranked = len(decode_cursor(cursor)) == 2
+    else:
+        ranked = is_selective(kind, words)
+    order = "rank" if ranked else "recent"
+    return (*fts_query(kind, words, selected, order), order)
@@ -1,24 +1,41 @@
 #!/usr/bin/env python3
 """
-Seed file — resets the database and populates it with sample data.
+Seed file — resets the database and populates it with data.
 
 Run from the server/ directory:
-    python seed.py
+    python seed.py                  # small hand-written sample
+    python seed.py --generate       # large, deterministic synthetic dataset (see --help)
 """
 
-from datetime import date
-from app import app
+import argparse
+import random
+import time
+from datetime import date, timedelta
+
+import analytics
+import records
+import versions
+from app import create_app
 from models import db, Exercise, Workout, WorkoutExercise
 
-with app.app_context():
 
-    # ── Reset all tables ───────────────────────────────────────────────────────
+# ── Reset ─────────────────────────────────────────────────────────────────────
+def reset():
     print("Clearing existing data...")
     WorkoutExercise.query.delete()
     Workout.query.delete()
     Exercise.query.delete()
+    new_epoch()
+
+
+def new_epoch():
+    """Change every ETag, so a running server stops serving the old data."""
+    versions.bump(versions.EPOCH)
     db.session.commit()
 
+
+# ── Sample data ───────────────────────────────────────────────────────────────
+def seed_sample():
     # ── Seed Exercises ─────────────────────────────────────────────────────────
     print("Seeding exercises...")
     e1  = Exercise(name="Barbell Back Squat",  category="strength",    equipment_needed=True)
@@ -106,4 +123,132 @@ with app.app_context():
     print(f"\n  Exercise: {sample_exercise}")
     print(f"  Appears in {len(sample_exercise.workouts)} workout(s).")
 
+
+# ── Synthetic data ────────────────────────────────────────────────────────────
+CATEGORIES = ["strength", "cardio", "flexibility", "balance", "plyometrics", "sports", "other"]
+BASE_NAMES = [
+    "Squat", "Deadlift", "Bench Press", "Row", "Pull-Up", "Overhead Press", "Lunge",
+    "Plank", "Curl", "Extension", "Swing", "Box Jump", "Run", "Bike", "Stretch", "Carry",
+]
+VARIANTS = ["Barbell", "Dumbbell", "Kettlebell", "Cable", "Machine", "Banded", "Single-Arm", "Tempo"]
+NOTES = [
+    "Felt strong today.", "Heavy deadlift day, grip gave out on the last set.",
+    "Deload week — kept everything light.", "Short on time, supersets only.",
+    "Squat PR attempt.", "Conditioning circuit, rest under 60s.",
+    "Mobility and core focus.", "Bench felt heavy, cut volume.",
+]
+
+
+def _spread(total, buckets, i):
+    """How many of `total` items land in bucket `i` when spread evenly."""
+    return total * (i + 1) // buckets - total * i // buckets
+
+
+def generate(n_exercises, n_workouts, n_workout_exercises,
+             seed=42, chunk_size=50_000, start=date(2015, 1, 1), days=3650):
+    """
+    Bulk-insert a deterministic synthetic dataset with explicit ids 1..n, `chunk_size`
+    rows per Core executemany transaction. Returns {table: (rows, seconds)}.
+    """
+    if n_workouts and n_workout_exercises > n_workouts * n_exercises:
+        raise ValueError("More workout_exercises requested than distinct (workout, exercise) pairs.")
+
+    rng = random.Random(seed)
+    stats = {}
+
+    def insert(table, rows):
+        began = time.perf_counter()
+        count, chunk = 0, []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                with db.engine.begin() as conn:
+                    conn.execute(table.insert(), chunk)
+                count += len(chunk)
+                chunk = []
+        if chunk:
+            with db.engine.begin() as conn:
+                conn.execute(table.insert(), chunk)
+            count += len(chunk)
+        elapsed = time.perf_counter() - began
+        stats[table.name] = (count, elapsed)
+        rate = count / elapsed if elapsed else float("inf")
+        print(f"  {table.name}: {count:,} rows in {elapsed:.1f}s ({rate:,.0f} rows/s)")
+
+    def exercises():
+        for i in range(1, n_exercises + 1):
+            base = BASE_NAMES[i % len(BASE_NAMES)]
+            variant = VARIANTS[(i // len(BASE_NAMES)) % len(VARIANTS)]
+            yield {
+                "id": i,
+                "name": f"{variant} {base} {i}",
+                "category": rng.choice(CATEGORIES),
+                "equipment_needed": rng.random() < 0.7,
+            }
+
+    def workouts():
+        for i in range(1, n_workouts + 1):
+            yield {
+                "id": i,
+                "date": start + timedelta(days=rng.randrange(days)),
+                "duration_minutes": rng.randint(15, 180),
+                "notes": rng.choice(NOTES) if rng.random() < 0.6 else None,
+            }
+
+    def workout_exercises():
+        exercise_ids = range(1, n_exercises + 1)
+        for w in range(1, n_workouts + 1):
+            for e in rng.sample(exercise_ids, _spread(n_workout_exercises, n_workouts, w - 1)):
+                if rng.random() < 0.2:
+                    sets, reps, duration = rng.choice([None, rng.randint(1, 5)]), None, rng.randint(15, 1800)
+                else:
+                    sets, reps, duration = rng.randint(1, 6), rng.randint(1, 20), None
+                yield {
+                    "workout_id": w, "exercise_id": e,
+                    "sets": sets, "reps": reps, "duration_seconds": duration,
+                }
+
+    print("Generating synthetic data...")
+    began = time.perf_counter()
+    insert(Exercise.__table__, exercises())
+    insert(Workout.__table__, workouts())
+    insert(WorkoutExercise.__table__, workout_exercises())
+    total = sum(count for count, _ in stats.values())
+    elapsed = time.perf_counter() - began
+    print(f"  total: {total:,} rows in {elapsed:.1f}s ({total / elapsed:,.0f} rows/s)")
+
+    began = time.perf_counter()
+    analytics.rebuild()
+    records.rebuild()
+    print(f"  rollups and records rebuilt in {time.perf_counter() - began:.1f}s")
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reset and seed the database.")
+    parser.add_argument("--generate", action="store_true",
+                        help="generate a large synthetic dataset instead of the sample")
+    parser.add_argument("--exercises", type=int, default=1_000)
+    parser.add_argument("--workouts", type=int, default=100_000)
+    parser.add_argument("--workout-exercises", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=42, help="RNG seed (default 42)")
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    args = parser.parse_args()
+
+    with create_app().app_context():
+        reset()
+        if args.generate:
+            generate(
+                args.exercises, args.workouts, args.workout_exercises,
+                seed=args.seed, chunk_size=args.chunk_size,
+            )
+        else:
+            seed_sample()
+            analytics.rebuild()
+            records.rebuild()
+
     print("\n✅ Database seeded successfully!")
+
+
+if __name__ == "__main__":
+    main()
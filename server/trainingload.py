@@ -0,0 +1,160 @@
+"""Training-load time series: daily and weekly load, acute:chronic ratios and heatmap levels."""
+
+from datetime import date, timedelta
+
+import numpy as np
+from flask import request
+
+from models import db, Workout, DailyWorkoutRollup
+
+ACUTE_DAYS = 7
+CHRONIC_DAYS = 28
+MAX_DAYS = 3660
+MEASURES = ("duration_minutes", "volume")
+
+
+# ── Cache scopes ──────────────────────────────────────────────────────────────
+def month_scope(year, month):
+    """The scope of one calendar month, `month:YYYY-MM` (the year zero-padded)."""
+    return f"month:{year:04d}-{month:02d}"
+
+
+def scopes(days):
+    """The `month:YYYY-MM` scopes a write of data dated `days` must bump."""
+    return {month_scope(day.year, day.month) for day in days}
+
+
+def scopes_of(where):
+    """The `month:` scopes of the workouts matching `where`; read before deleting them."""
+    return scopes(db.session.scalars(db.select(Workout.date).where(where).distinct()))
+
+
+def _months(start, end):
+    months, year, month = [], start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        months.append(month_scope(year, month))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+
+def request_scopes():
+    """The `month:` scopes of the current request's window; empty when its arguments are invalid."""
+    try:
+        filters = parse_filters(request.args)
+    except ValueError:
+        return []
+    return _months(filters["from"] - timedelta(days=CHRONIC_DAYS - 1), filters["to"])
+
+
+# ── Queries ───────────────────────────────────────────────────────────────────
+def parse_filters(args):
+    """Read `from`, `to` (both required) and `measure`; raises ValueError with a client-facing message."""
+    filters = {}
+    for key in ("from", "to"):
+        try:
+            filters[key] = date.fromisoformat(args.get(key, ""))
+        except ValueError:
+            raise ValueError(f"'{key}' is required and must be a date (YYYY-MM-DD).")
+    if filters["from"] > filters["to"]:
+        raise ValueError("'from' must not be after 'to'.")
+    earliest = date.min + timedelta(days=CHRONIC_DAYS - 1)
+    if filters["from"] < earliest:
+        raise ValueError(f"'from' must not be before {earliest.isoformat()}.")
+    if (filters["to"] - filters["from"]).days >= MAX_DAYS:
+        raise ValueError(f"The range cannot span more than {MAX_DAYS} days.")
+    filters["measure"] = args.get("measure", "duration_minutes")
+    if filters["measure"] not in MEASURES:
+        raise ValueError(f"'measure' must be one of: {', '.join(MEASURES)}.")
+    return filters
+
+
+def daily_columns(start, end):
+    """(day offsets from `start`, minutes, volume) arrays for the days in `start`..`end` with a workout."""
+    r = DailyWorkoutRollup
+    rows = db.session.execute(
+        db.select(r.day, r.duration_minutes, r.volume).where(r.day.between(start, end))
+    ).all()
+    if not rows:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, empty
+    days, minutes, volumes = zip(*rows)
+    offsets = np.fromiter((d.toordinal() for d in days), dtype=np.int64, count=len(rows))
+    return (
+        offsets - start.toordinal(),
+        np.array(minutes, dtype=np.int64),
+        np.array(volumes, dtype=np.int64),
+    )
+
+
+def _trailing_means(cumulative, window, length):
+    """Mean over the `window` days ending at each of the last `length` days."""
+    return (cumulative[-length:] - cumulative[-length - window:-window]) / window
+
+
+def _rounded(values):
+    """Floats rounded to 2 places, NaN as None, ready for JSON."""
+    return [None if np.isnan(v) else v for v in np.round(values, 2).tolist()]
+
+
+def series(filters):
+    """The training-load report for `filters`: daily rows, level thresholds and weekly totals."""
+    first, last = filters["from"], filters["to"]
+    start = first - timedelta(days=CHRONIC_DAYS - 1)
+    size = (last - start).days + 1
+    length = (last - first).days + 1
+
+    offsets, minutes, volumes = daily_columns(start, last)
+    daily = {name: np.zeros(size, dtype=np.int64) for name in MEASURES}
+    daily["duration_minutes"][offsets] = minutes
+    daily["volume"][offsets] = volumes
+
+    load = daily[filters["measure"]]
+    cumulative = np.concatenate(([0], np.cumsum(load)))
+    acute = _trailing_means(cumulative, ACUTE_DAYS, length)
+    chronic = _trailing_means(cumulative, CHRONIC_DAYS, length)
+    acwr = np.full(length, np.nan)
+    np.divide(acute, chronic, out=acwr, where=chronic > 0)
+
+    in_range = {name: values[-length:] for name, values in daily.items()}
+    active = in_range[filters["measure"]]
+    levels = np.zeros(length, dtype=np.int64)
+    thresholds = []
+    if active.any():
+        thresholds = np.quantile(active[active > 0], [0.25, 0.5, 0.75])
+        levels = np.where(active > 0, 1 + np.searchsorted(thresholds, active, side="left"), 0)
+        thresholds = np.round(thresholds, 2).tolist()
+
+    # Monday-based weeks: the range's first day, then every Monday after it
+    week_starts = np.unique(np.r_[0, np.arange((7 - first.weekday()) % 7, length, 7)])
+    weekly = {name: np.add.reduceat(values, week_starts) for name, values in in_range.items()}
+
+    dates = [(first + timedelta(days=i)).isoformat() for i in range(length)]
+    days = [
+        {
+            "date": day, "duration_minutes": m, "volume": v,
+            "acute": a, "chronic": c, "acwr": r, "level": l,
+        }
+        for day, m, v, a, c, r, l in zip(
+            dates, in_range["duration_minutes"].tolist(), in_range["volume"].tolist(),
+            _rounded(acute), _rounded(chronic), _rounded(acwr), levels.tolist(),
+        )
+    ]
+    weeks = [
+        {
+            "week": (first + timedelta(days=i - (first.weekday() if i == 0 else 0))).isoformat(),
+            "duration_minutes": m, "volume": v,
+        }
+        for i, m, v in zip(
+            week_starts.tolist(), weekly["duration_minutes"].tolist(), weekly["volume"].tolist()
+        )
+    ]
+    return {
+        "from": first.isoformat(),
+        "to": last.isoformat(),
+        "measure": filters["measure"],
+        "acute_days": ACUTE_DAYS,
+        "chronic_days": CHRONIC_DAYS,
+        "levels": thresholds,
+        "days": days,
+        "weeks": weeks,
+    }
@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Full export / import of the training log as NDJSON, resumable from a checkpoint file.
+
+Run from the server/ directory:
+    python transfer.py export backup.ndjson.gz      # .gz compresses
+    python transfer.py export - > backup.ndjson
+    python transfer.py import backup.ndjson.gz [--chunk-size 50000]
+"""
+
+import argparse
+import gzip
+import json
+import os
+import sys
+import time
+import uuid
+import zlib
+from datetime import date
+
+import analytics
+import records
+import trainingload
+from models import db, Exercise, ResourceVersion, Workout, WorkoutExercise, upsert
+from versions import bump
+
+FORMAT = "workout-log"
+VERSION = 1
+EXPORT_CHUNK = 5000
+IMPORT_CHUNK = 50_000
+
+# (record type, model, exported columns), in dependency order.
+TABLES = (
+    ("exercise", Exercise, ("id", "name", "category", "equipment_needed")),
+    ("workout", Workout, ("id", "date", "duration_minutes", "notes")),
+    ("workout_exercise", WorkoutExercise, ("workout_id", "exercise_id", "sets", "reps", "duration_seconds")),
+)
+
+
+# ── Export ────────────────────────────────────────────────────────────────────
+def _json_default(value):
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def export_lines(chunk_size=EXPORT_CHUNK):
+    """Yield the whole log as NDJSON text, one block per fetched chunk (inside an app context)."""
+    yield json.dumps({"type": "header", "format": FORMAT, "version": VERSION}) + "\n"
+    for kind, model, names in TABLES:
+        stmt = (
+            db.select(*(getattr(model, name) for name in names))
+            .order_by(model.id)
+            .execution_options(stream_results=True, yield_per=chunk_size)
+        )
+        for rows in db.session.execute(stmt).partitions():
+            yield "".join(
+                json.dumps({"type": kind, **dict(zip(names, row))}, default=_json_default) + "\n"
+                for row in rows
+            )
+
+
+def gzipped(blocks):
+    """Compress a stream of text blocks into one gzip stream, block by block."""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for block in blocks:
+        data = compressor.compress(block.encode())
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export_file(path, chunk_size=EXPORT_CHUNK):
+    """Write the log to `path` ("-" for stdout); gzip when it ends in .gz."""
+    began, lines = time.perf_counter(), 0
+    if path == "-":
+        out = sys.stdout
+    elif path.endswith(".gz"):
+        out = gzip.open(path, "wt", encoding="utf-8", compresslevel=6)
+    else:
+        out = open(path, "w", encoding="utf-8")
+    try:
+        for block in export_lines(chunk_size):
+            out.write(block)
+            lines += block.count("\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    elapsed = time.perf_counter() - began
+    print(f"Exported {lines - 1:,} records in {elapsed:.1f}s", file=sys.stderr)
+    return lines - 1
+
+
+# ── Import ────────────────────────────────────────────────────────────────────
+def _open(path):
+    """Open an export for reading, compressed or not (sniffed, not by name)."""
+    if path == "-":
+        return sys.stdin
+    with open(path, "rb") as f:
+        magic = f.read(2)
+    if magic == b"\x1f\x8b":
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, "r", encoding="utf-8")
+
+
+def _load_checkpoint(path):
+    if path and os.path.exists(path):
+        with open(path) as f:
+            state = json.load(f)
+        state["exercises"] = {int(k): v for k, v in state["exercises"].items()}
+        return state
+    return None
+
+
+def _save_checkpoint(path, state):
+    """Write the checkpoint atomically, so a crash never leaves half a file."""
+    if not path:
+        return
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(state, f)
+    os.replace(tmp, path)
+
+
+class Importer:
+    """Buffers one chunk of records and writes it in a single transaction."""
+
+    def __init__(self, state):
+        self.state = state
+        self.exercises, self.workouts, self.entries = [], [], []
+
+    def add(self, record, line_no):
+        kind = record.get("type")
+        try:
+            if kind == "exercise":
+                if not isinstance(record["id"], int) or not isinstance(record["name"], str):
+                    raise TypeError("'id' must be an integer and 'name' a string")
+                self.exercises.append({
+                    "id": record["id"],
+                    "name": record["name"],
+                    "category": record["category"],
+                    "equipment_needed": record["equipment_needed"],
+                })
+            elif kind == "workout":
+                self.workouts.append({
+                    "id": record["id"] + self.state["workout_offset"],
+                    "date": date.fromisoformat(record["date"]),
+                    "duration_minutes": record["duration_minutes"],
+                    "notes": record.get("notes"),
+                })
+                self.state["max_workout_id"] = max(self.state["max_workout_id"], record["id"])
+            elif kind == "workout_exercise":
+                self.entries.append(record)
+            else:
+                raise ValueError(f"unknown record type {kind!r}")
+        except (KeyError, TypeError, ValueError) as err:
+            raise ValueError(f"line {line_no}: invalid {kind} record ({err})")
+
+    def flush(self):
+        """Write the buffered records; returns how many rows were inserted."""
+        # DO NOTHING on conflict: replaying the chunk a crashed run was writing is harmless
+        with db.engine.begin() as conn:
+            inserted = self._write_exercises(conn)
+            if self.workouts:
+                stmt = upsert(Workout.__table__).on_conflict_do_nothing()
+                inserted += conn.execute(stmt, self.workouts).rowcount
+            if self.entries:
+                rows = [self._entry(record) for record in self.entries]
+                stmt = upsert(WorkoutExercise.__table__).on_conflict_do_nothing()
+                inserted += conn.execute(stmt, rows).rowcount
+        self.exercises, self.workouts, self.entries = [], [], []
+        return inserted
+
+    def _write_exercises(self, conn):
+        if not self.exercises:
+            return 0
+        table = Exercise.__table__
+        rows = [
+            {"name": r["name"], "category": r["category"], "equipment_needed": r["equipment_needed"]}
+            for r in self.exercises
+        ]
+        inserted = conn.execute(upsert(table).on_conflict_do_nothing(), rows).rowcount
+        names = [r["name"] for r in self.exercises]
+        by_name = {}
+        for start in range(0, len(names), 900):
+            by_name.update(conn.execute(
+                db.select(table.c.name, table.c.id).where(table.c.name.in_(names[start:start + 900]))
+            ).all())
+        for record in self.exercises:
+            self.state["exercises"][record["id"]] = by_name[record["name"]]
+        return inserted
+
+    def _entry(self, record):
+        try:
+            exercise_id = self.state["exercises"][record["exercise_id"]]
+        except KeyError:
+            raise ValueError(f"entry refers to exercise {record['exercise_id']}, which is not in the file")
+        return {
+            "workout_id": record["workout_id"] + self.state["workout_offset"],
+            "exercise_id": exercise_id,
+            "sets": record.get("sets"),
+            "reps": record.get("reps"),
+            "duration_seconds": record.get("duration_seconds"),
+        }
+
+
+def import_file(path, chunk_size=IMPORT_CHUNK, checkpoint=None):
+    """
+    Import an export into the current database, resuming from the `checkpoint` file if given.
+    Returns the number of rows inserted by this run.
+    """
+    # Exercises are matched by name; workouts keep their ids shifted by the
+    # target's highest id, so only the exercise map is held in memory.
+    state = _load_checkpoint(checkpoint)
+    if state is None:
+        state = {
+            "id": uuid.uuid4().hex,
+            "source": os.path.abspath(path) if path != "-" else path,
+            "lines": 0,
+            "workout_offset": db.session.scalar(db.select(db.func.max(Workout.id))) or 0,
+            "max_workout_id": 0,
+            "exercises": {},
+        }
+        db.session.rollback()
+    elif state["source"] != (os.path.abspath(path) if path != "-" else path):
+        raise ValueError(f"checkpoint {checkpoint} belongs to {state['source']}; use --restart")
+    elif state["lines"]:
+        print(f"Resuming after line {state['lines']:,}", file=sys.stderr)
+    if "id" not in state:  # a checkpoint written before imports had ids
+        state["id"] = uuid.uuid4().hex
+        _save_checkpoint(checkpoint, state)
+
+    began, inserted = time.perf_counter(), 0
+    importer = Importer(state)
+    pending = 0
+    with _open(path) as f:
+        for line_no, line in enumerate(f, 1):
+            if line_no == 1:
+                header = json.loads(line)
+                if header.get("format") != FORMAT or header.get("version") != VERSION:
+                    raise ValueError(f"{path} is not a {FORMAT} v{VERSION} export")
+                continue
+            if line_no <= state["lines"] or not line.strip():
+                continue
+            importer.add(json.loads(line), line_no)
+            pending += 1
+            if pending >= chunk_size:
+                inserted += importer.flush()
+                state["lines"], pending = line_no, 0
+                _save_checkpoint(checkpoint, state)
+                print(f"  {line_no:,} lines, {inserted:,} rows inserted", file=sys.stderr)
+        if pending:
+            inserted += importer.flush()
+            state["lines"] = line_no
+            _save_checkpoint(checkpoint, state)
+
+    # Rollups and cache versions for everything this import added, once: the
+    # marker scope commits with them, so a crash before the checkpoint is
+    # removed doesn't add the same deltas again on the next run.
+    marker = f"import:{state['id']}"
+    if db.session.get(ResourceVersion, marker) is None:
+        first, last = state["workout_offset"] + 1, state["workout_offset"] + state["max_workout_id"]
+        analytics.add_workouts(Workout.id.between(first, last))
+        analytics.add_entries(WorkoutExercise.workout_id.between(first, last))
+        records.add_entries(WorkoutExercise.workout_id.between(first, last))
+        bump(
+            "workouts", "exercises", marker,
+            *(f"exercise:{e}" for e in set(state["exercises"].values())),
+            *trainingload.scopes_of(Workout.id.between(first, last)),
+        )
+        _reseed_sequences()
+        db.session.commit()
+    if checkpoint and os.path.exists(checkpoint):
+        os.remove(checkpoint)
+
+    elapsed = time.perf_counter() - began
+    rate = inserted / elapsed if elapsed else float("inf")
+    print(f"Imported {inserted:,} rows in {elapsed:.1f}s ({rate:,.0f} rows/s)", file=sys.stderr)
+    return inserted
+
+
+def _reseed_sequences():
+    """PostgreSQL: move id sequences past the explicitly inserted ids."""
+    if db.engine.dialect.name != "postgresql":
+        return
+    for table in ("workouts", "exercises"):
+        db.session.execute(db.text(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+            f"(SELECT COALESCE(MAX(id), 1) FROM {table}))"
+        ))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export or import the whole training log as NDJSON.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    exp = sub.add_parser("export", help="write the log to a file (.gz to compress) or - for stdout")
+    exp.add_argument("path")
+    exp.add_argument("--chunk-size", type=int, default=EXPORT_CHUNK)
+    imp = sub.add_parser("import", help="load an export into this database")
+    imp.add_argument("path")
+    imp.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK)
+    imp.add_argument("--checkpoint", help="resume file (default: <path>.checkpoint)")
+    imp.add_argument("--restart", action="store_true", help="ignore an existing checkpoint")
+    args = parser.parse_args()
+
+    from app import create_app  # app -> routes -> transfer; import it late
+    with create_app().app_context():
+        if args.command == "export":
+            export_file(args.path, args.chunk_size)
+        else:
+            checkpoint = args.checkpoint or (f"{args.path}.checkpoint" if args.path != "-" else None)
+            if args.restart and checkpoint and os.path.exists(checkpoint):
+                os.remove(checkpoint)
+            import_file(args.path, args.chunk_size, checkpoint)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Write-version counters per scope, and conditional GETs (ETag / Last-Modified) built from them."""
+
+import hashlib
+from datetime import datetime, timezone
+from functools import wraps
+
+from flask import g, make_response, request
+
+import cache
+from models import db, ResourceVersion, upsert
+
+# Part of every ETag; bumped when the whole dataset is replaced (see seed.py).
+EPOCH = "epoch"
+# Part of every detail view's ETag; bumped by set-based deletes, which would
+# otherwise need one `workout:<id>` scope per row they touch.
+DELETIONS = "deletions"
+
+# ── Writes ────────────────────────────────────────────────────────────────────
+def bump(*scopes):
+    """
+    Increment each scope's version in the current session's transaction,
+    and drop locally cached responses that depended on them.
+    """
+    scopes = sorted(set(scopes))
+    if not scopes:
+        return
+    cache.invalidate(*scopes)
+    now = datetime.utcnow()
+    table = ResourceVersion.__table__
+    stmt = upsert(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.scope],
+        set_={"version": table.c.version + 1, "updated_at": stmt.excluded.updated_at},
+    )
+    db.session.execute(stmt, [
+        {"scope": scope, "version": 1, "updated_at": now} for scope in scopes
+    ])
+
+
+# ── Reads ─────────────────────────────────────────────────────────────────────
+def current(scopes):
+    """
+    Return (etag, last_modified) for the given scopes and the current request.
+    Scopes that have never been written count as version 0.
+    """
+    scopes = [*scopes, EPOCH]
+    rows = db.session.execute(
+        db.select(ResourceVersion.scope, ResourceVersion.version, ResourceVersion.updated_at)
+        .where(ResourceVersion.scope.in_(scopes))
+    ).all()
+    found = {row.scope: row for row in rows}
+    parts = [f"{scope}={found[scope].version if scope in found else 0}" for scope in sorted(scopes)]
+    # The query string selects a different representation (page, filters).
+    parts.append(request.full_path)
+    etag = hashlib.sha1("|".join(parts).encode()).hexdigest()[:20]
+    last_modified = max((row.updated_at for row in rows), default=None)
+    return etag, last_modified
+
+
+def not_modified(etag, last_modified):
+    """Whether the request's validators show the client's copy is current."""
+    if request.if_none_match.star_tag:
+        return False
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if request.if_modified_since and last_modified:
+        modified = last_modified.replace(microsecond=0, tzinfo=timezone.utc)
+        return modified <= request.if_modified_since
+    return False
+
+
+def conditional(*scope_templates):
+    """
+    Decorate a GET route with ETag / Last-Modified validation. Templates are formatted with
+    the view arguments, e.g. "workout:{id}"; a callable returns a list of scopes instead.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(**kwargs):
+            scopes = []
+            for template in scope_templates:
+                if callable(template):
+                    scopes.extend(template(**kwargs))
+                else:
+                    scopes.append(template.format(**kwargs))
+            etag, last_modified = current(scopes)
+            g.etag, g.scopes = etag, scopes  # for @cached
+            if not_modified(etag, last_modified):
+                response = make_response("", 304)
+            else:
+                response = make_response(view(**kwargs))
+                if response.status_code != 200:
+                    return response
+                # `*` matches any current representation, so only one that exists
+                if request.if_none_match.star_tag:
+                    response = make_response("", 304)
+            response.set_etag(etag, weak=True)  # weak: one validator for every content-coding
+            if last_modified:
+                response.last_modified = last_modified.replace(tzinfo=timezone.utc)
+            return response
+        return wrapper
+    return decorator